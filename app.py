@@ -1,12 +1,12 @@
+import os
 import streamlit as st
-import pandas as pd
 import numpy as np
-import time
 import datetime
-import plotly.graph_objects as go
-import base64
-from pathlib import Path
-from components import create_track_plot, render_track_panel, render_car_panel
+from components import render_track_view, render_track_panel, render_car_panel, render_lap_chart, render_speed_trace_panel, asset_path, clips, static_image_url
+from simulation import RaceClock, RaceEngine, generate_telemetry, get_track_geometry, synthesize_lap_channels
+from simulation.sector_timing import OVERALL_BEST, PERSONAL_BEST
+from simulation.strategy import PIT_NOW, PIT_SOON, STAY_OUT
+from simulation.replay import Recording
 from ai_commentary import AICommentarySystem, create_commentary_interface, play_audio
 
 # Try to import WeatherClient (weather API wrapper). If unavailable, we'll fall back to a small mock.
@@ -428,25 +428,19 @@ def get_css():
     </style>
     """
 
-# Function to encode image to base64
-def get_image_base64(image_path):
-    with open(image_path, "rb") as img_file:
-        return base64.b64encode(img_file.read()).decode()
+# Camera clips, streamed by URL from the static route (range requests allow seeking)
+clips.register("lap", asset_path("F_Lap_Generation_Request.mp4"))
+clips.register("pit", asset_path("Pit.mp4"))
 
-# Function to encode video to base64
-def get_video_base64(video_path):
-    with open(video_path, "rb") as video_file:
-        return base64.b64encode(video_file.read()).decode()
-
-def render_video(video_path, widget):
-    """Render video in the given widget"""
+def render_video(clip_name, widget):
+    """Render a registered video clip in the given widget"""
     try:
-        video_base64 = get_video_base64(video_path)
+        video_url = clips.url(clip_name)
         widget.markdown(f'''
         <div class="panel" style="position: relative; z-index: 1000;">
             <div class="panel-title">LIVE CAMERA</div>
             <video width="100%" height="300" autoplay muted loop playsinline style="border-radius: 10px; object-fit: cover; position: relative; z-index: 1001; background: #000;">
-                <source src="data:video/mp4;base64,{video_base64}" type="video/mp4">
+                <source src="{video_url}" type="video/mp4">
                 Your browser does not support the video tag.
             </video>
         </div>
@@ -463,26 +457,27 @@ def render_video(video_path, widget):
 
 # Function to create background elements HTML
 def create_background_elements():
-    elements_dir = Path("Elements")
+    elements_dir = asset_path("Elements")
     elements_html = '<div class="background-elements">'
     
-    # Define element configurations
+    # Define element configurations: (file, CSS class, displayed width in px)
     elements_config = [
-        ("sun.png", "sun"),
-        ("planet.png", "planet"),
-        ("moon.png", "moon"),
-        ("star8.png", "star8"),
-        ("spark.png", "spark"),
-        ("spiral_galaxy.png", "spiral-galaxy"),
-        ("orbit_rings.png", "orbit-rings"),
-        ("planet_ring.png", "planet-ring")
+        ("sun.png", "sun", 180),
+        ("planet.png", "planet", 140),
+        ("moon.png", "moon", 60),
+        ("star8.png", "star8", 50),
+        ("spark.png", "spark", 35),
+        ("spiral_galaxy.png", "spiral-galaxy", 160),
+        ("orbit_rings.png", "orbit-rings", 200),
+        ("planet_ring.png", "planet-ring", 130)
     ]
     
-    for filename, class_name in elements_config:
+    for filename, class_name, width in elements_config:
         image_path = elements_dir / filename
         if image_path.exists():
-            img_base64 = get_image_base64(image_path)
-            elements_html += f'<img src="data:image/png;base64,{img_base64}" class="bg-element {class_name}" alt="{class_name}">'
+            # Served by URL at 2x the CSS width for high-DPI screens
+            img_url = static_image_url(image_path, max_width=2 * width)
+            elements_html += f'<img src="{img_url}" class="bg-element {class_name}" alt="{class_name}">'
     
     elements_html += '</div>'
     return elements_html
@@ -492,16 +487,14 @@ st.markdown(get_css(), unsafe_allow_html=True)
 st.markdown(create_background_elements(), unsafe_allow_html=True)
 
 # Main content
-#st.image('/Users/anudeepbonagiri/Desktop/hackTX v2.0/northmark-dashboard/lyra.png', caption=None, width=100)
 st.markdown(
     """
     <div style="text-align: center;">
-        <img src="data:image/png;base64,{}" width="167">
+        <img src="{}" width="167">
     </div>
     """.format(
-        # Convert your local image file to a base64 string
-        # so it can be embedded directly into the HTML
-        base64.b64encode(open('/Users/anudeepbonagiri/Desktop/hackTX v2.0/northmark-dashboard/lyra.png', 'rb').read()).decode()
+        # Logo is resized once per process and served from the static route
+        static_image_url(asset_path("lyra.png"), max_width=2 * 167)
     ),
     unsafe_allow_html=True
 )
@@ -553,175 +546,164 @@ st.markdown(
 
 # Simulation setup
 laps = 20
-update_interval = 2  # seconds
-radius = 100  # track radius
+update_interval = 2  # seconds between race ticks at 1x speed
+min_refresh = 0.5  # fastest panel refresh, in seconds; faster ticks are skipped
+playback_speeds = [0.5, 1, 2, 5, 10, 20, 50]
+weather_interval = 60  # seconds between weather refreshes
+lap_chart_pixels = 480  # plot width the lap chart is downsampled for
+base_lap_time = 90.0  # prior base pace for the lap-time model, in seconds
+strategy_scenarios = 1000  # Monte Carlo scenarios per pit option
+race_seed = 42  # telemetry seed shared by the race engine and the lap channels
+replay_path = os.getenv("RACE_REPLAY")  # recorded race to play back instead of synthetic telemetry
 
-# Generate synthetic telemetry
-np.random.seed(42)
-data = []
-tire_wear = 0
-fuel = 100
 
-for lap in range(1, laps + 1):
-    lap_time = np.random.normal(90, 2) + (lap * 0.5)
-    tire_wear += np.random.uniform(3, 5)
-    fuel -= np.random.uniform(3, 6)
-    data.append([lap, lap_time, tire_wear, fuel])
+@st.cache_resource
+def race_lap_channels(laps, seed=race_seed, hz=20):
+    """High-frequency channels for the dashboard's car, shared read-only by every session."""
+    lap_times = generate_telemetry(n_cars=1, n_laps=laps, seed=seed)["lap_time"]
+    return synthesize_lap_channels(get_track_geometry(), lap_times, hz=hz, seed=seed)
 
-df = pd.DataFrame(data, columns=["lap", "lap_time", "tire_wear", "fuel"])
 
-# ----- Layout: three-column dashboard mirroring target UI -----
-left_col, center_col, right_col = st.columns([1.2, 1.6, 1.2])
+@st.cache_resource
+def open_recording(path):
+    """Memory-mapped recording shared by every session; laps are read as they are played."""
+    return Recording(path)
 
-with left_col:
-    # Race Status (Track View)
-    track_plot = render_track_panel()
 
-    # Live camera video placeholder (will be updated dynamically)
-    video_widget = st.empty()
-    
-    # Initialize with default video
-    render_video("F_Lap_Generation_Request.mp4", video_widget)
+recording = open_recording(replay_path) if replay_path else None
+if recording is not None:
+    laps = recording.n_laps
 
-with center_col:
-    # Car visualization from Elements folder
-    render_car_panel()
+# Race progress lives in session state, so reruns triggered by widgets or by
+# fragment ticks pick the race up where it is instead of restarting it
+if "race_clock" not in st.session_state:
+    st.session_state.race_clock = RaceClock(update_interval, n_ticks=laps)
+race_clock = st.session_state.race_clock
 
-    # Live Commentary button under the car image
-    st.markdown('<div class="panel"><div class="panel-title">AI COMMENTARY</div>', unsafe_allow_html=True)
-    
-    # Commentary button placeholder (will be updated in simulation loop)
-    commentary_button_placeholder = st.empty()
-    
-    st.markdown('</div>', unsafe_allow_html=True)
+speed = st.sidebar.select_slider("Playback speed", options=playback_speeds, value=1,
+                                 format_func=lambda s: f"{s}x", key="playback_speed")
+if speed != race_clock.speed:
+    race_clock.set_speed(speed)
 
-with right_col:
-    # Strategy decision card sits at the top
-    decision_card = st.empty()
+# Panels refresh once per tick, but never faster than min_refresh; ticks that
+# fall between two refreshes are skipped rather than queued
+refresh_interval = max(update_interval / race_clock.speed, min_refresh)
 
-    # Place Lap Time Trend directly under the decision card
-    st.markdown('<div class="panel"><div class="panel-title">LAP TIME TREND</div>', unsafe_allow_html=True)
-    lap_chart = st.empty()
-    st.markdown('</div>', unsafe_allow_html=True)
 
-    # Weather section moved to right side
-    # Create an updatable placeholder for the weather panel
-    weather_widget = st.empty()
+def current_tick():
+    """Lap index the race has reached, read from the session's race clock."""
+    return race_clock.tick()
 
-    # Default coordinates (Austin, TX). Change to track coordinates if known.
-    _weather_lat, _weather_lon = 30.2672, -97.7431
 
-    # Instantiate WeatherClient if available (graceful fallback to mock data)
-    _wc = None
-    if WeatherClient:
-        try:
-            _wc = WeatherClient(selected_date=datetime.date.today().isoformat())
-        except Exception:
-            _wc = None
-
-    def _get_weather_snapshot():
-        """Return weather dict with either real data or a mock snapshot."""
-        if _wc:
-            try:
-                epochs = _wc.generate_target_epochs(1)
-                target_epoch = int(epochs[0])
-                res = _wc.get_weather_at_time(_weather_lat, _weather_lon, target_epoch)
-            except Exception as e:
-                res = {"error": "exception", "message": str(e)}
+# Strategy card color for each recommendation
+DECISION_COLORS = {PIT_NOW: "red", PIT_SOON: "yellow", STAY_OUT: "green"}
+
+
+# Sector colors: purple = overall best, green = personal best, yellow = slower
+SECTOR_STATUS_COLORS = {OVERALL_BEST: "#b388ff", PERSONAL_BEST: "#2ecc71"}
+
+
+def session_engine(tick):
+    """Return this session's RaceEngine, advanced through lap index ``tick``."""
+    state = st.session_state
+    if "race_engine" not in state:
+        # Weather is live (wall clock), not race laps, so the engine does not sample it here
+        options = dict(geometry=get_track_geometry(), n_scenarios=strategy_scenarios, base_lap_time=base_lap_time)
+        if recording is not None:
+            state.race_engine = RaceEngine.replay(recording, **options)
         else:
-            # Mock data when WeatherClient / network isn't available
-            res = {"current": {"temp": 22.4, "humidity": 56.0, "wind_speed": 3.5, "wind_dir": 135.0, "precip": 0.0, "pressure": 1013.5}}
-        return res
-
-    # Initial render of the weather panel (will be updated inside simulation loop)
-    _res = _get_weather_snapshot()
-    if "error" in _res:
-        _body = f"<div class='panel'><div class='panel-title'>WEATHER</div><div class='panel-placeholder' style='min-height:120px;padding:12px;'>Error: {_res.get('message','unknown')}</div></div>"
-    else:
-        _cur = _res["current"]
-        _body = f'''
-        <div class='panel'>
-          <div class='panel-title'>WEATHER</div>
-          <div style="padding:12px; min-height:120px; display:flex; gap:12px; align-items:center;">
-            <div style="flex:0 0 110px; text-align:center;">
-              <div style="font-family: 'Orbitron', monospace; color:#59e1c6; font-size:48px; font-weight:700;">{_cur.get('temp', 0):.1f}°C</div>
-              <div style="font-family: 'Orbitron', monospace; color:#a8dadc; font-size:12px;">Current</div>
-            </div>
-            <div style="flex:1;">
-              <div style="font-family: 'Orbitron', monospace; color:#a8dadc; font-size:14px;">Humidity: <strong style='color:#f1faee'>{_cur.get('humidity', 0):.0f}%</strong></div>
-              <div style="font-family: 'Orbitron', monospace; color:#a8dadc; font-size:14px;">Wind: <strong style='color:#f1faee'>{_cur.get('wind_speed', 0):.1f} m/s</strong> @ {_cur.get('wind_dir', 0):.0f}°</div>
-              <div style="font-family: 'Orbitron', monospace; color:#a8dadc; font-size:14px;">Precip: <strong style='color:#f1faee'>{_cur.get('precip', 0):.1f} mm</strong></div>
-              <div style="font-family: 'Orbitron', monospace; color:#a8dadc; font-size:14px;">Pressure: <strong style='color:#f1faee'>{_cur.get('pressure', 0):.0f} hPa</strong></div>
-            </div>
-          </div>
+            state.race_engine = RaceEngine(laps, seed=race_seed, **options)
+    state.race_engine.run_until(tick + 1)
+    return state.race_engine
+
+
+def race_state(tick):
+    """Latest telemetry and strategy call once the race has reached ``tick``."""
+    state = session_engine(tick).state()
+    state["color"] = DECISION_COLORS[state["decision"]]
+    return state
+
+
+def weather_panel_html(res):
+    """Weather panel markup for a WeatherClient response (or its error)."""
+    if "error" in res:
+        return f"<div class='panel'><div class='panel-title'>WEATHER</div><div class='panel-placeholder' style='min-height:120px;padding:12px;'>Error: {res.get('message','unknown')}</div></div>"
+    cur = res["current"]
+    return f'''
+    <div class='panel'>
+      <div class='panel-title'>WEATHER</div>
+      <div style="padding:12px; min-height:120px; display:flex; gap:12px; align-items:center;">
+        <div style="flex:0 0 110px; text-align:center;">
+          <div style="font-family: 'Orbitron', monospace; color:#59e1c6; font-size:48px; font-weight:700;">{cur.get('temp', 0):.1f}°C</div>
+          <div style="font-family: 'Orbitron', monospace; color:#a8dadc; font-size:12px;">Current</div>
+        </div>
+        <div style="flex:1;">
+          <div style="font-family: 'Orbitron', monospace; color:#a8dadc; font-size:14px;">Humidity: <strong style='color:#f1faee'>{cur.get('humidity', 0):.0f}%</strong></div>
+          <div style="font-family: 'Orbitron', monospace; color:#a8dadc; font-size:14px;">Wind: <strong style='color:#f1faee'>{cur.get('wind_speed', 0):.1f} m/s</strong> @ {cur.get('wind_dir', 0):.0f}°</div>
+          <div style="font-family: 'Orbitron', monospace; color:#a8dadc; font-size:14px;">Precip: <strong style='color:#f1faee'>{cur.get('precip', 0):.1f} mm</strong></div>
+          <div style="font-family: 'Orbitron', monospace; color:#a8dadc; font-size:14px;">Pressure: <strong style='color:#f1faee'>{cur.get('pressure', 0):.0f} hPa</strong></div>
         </div>
-        '''
-    weather_widget.markdown(_body, unsafe_allow_html=True)
+      </div>
+    </div>
+    '''
 
 
-# Function to make pit decision
-def get_decision(tire_wear, lap_delta):
-    if tire_wear > 65 or lap_delta > 0.6:       
-        return "PIT NOW", "red"
-    elif tire_wear > 45:
-        
-        return "Monitor Tires", "yellow"
-    else:
-        return "Stay Out", "green"
-
-# Simulation loop
-prev_lap_time = df.loc[0, "lap_time"]
-
-for i in range(len(df)):
-    lap = df.loc[i, "lap"]
-    lap_time = df.loc[i, "lap_time"]
-    tire_wear = df.loc[i, "tire_wear"]
-    fuel = df.loc[i, "fuel"]
-
-    # Compute lap delta
-    lap_delta = (lap_time - prev_lap_time) / prev_lap_time
-    prev_lap_time = lap_time
-
-    # Track plot using component
-    fig = create_track_plot(lap, laps, radius)
-    track_plot.plotly_chart(fig, use_container_width=True)
-    
-    # Race Status removed - track visualization only
-
-    # Lap time trend
-    fig2 = go.Figure()
-    fig2.add_trace(go.Scatter(
-        x=df["lap"][:i+1], 
-        y=df["lap_time"][:i+1], 
-        mode="lines+markers", 
-        name="Lap Time",
-        line=dict(color="#4ecdc4", width=3),
-        marker=dict(color="#ff6b6b", size=8)
-    ))
-    fig2.update_layout(
-        yaxis_title="Lap Time (s)", 
-        xaxis_title="Lap", 
-        height=220,
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(family="Orbitron, monospace", color="#f1faee"),
-        xaxis=dict(gridcolor='rgba(255,255,255,0.1)'),
-        yaxis=dict(gridcolor='rgba(255,255,255,0.1)')
-    )
-    lap_chart.plotly_chart(fig2, use_container_width=True)
+# ----- Tick-driven panels -----
+# Each panel is a fragment: a tick reruns only that panel, and interaction in
+# one panel does not rerun the rest of the script.
+
+@st.fragment(run_every=refresh_interval)
+def track_fragment():
+    # Static layers are cached client-side; the stable key keeps the component
+    # mounted, and the browser animates the car through this lap until the next tick
+    track_plot = render_track_panel()
+    with track_plot:
+        render_track_view(
+            session_engine(current_tick()).latest("lap"), laps, key="track_view", animate_seconds=refresh_interval,
+            advance=refresh_interval * race_clock.speed / update_interval / laps,
+        )
+
+
+@st.fragment(run_every=refresh_interval)
+def video_fragment():
+    # Video switching based on tire wear: once a lap lands in the pit window,
+    # the pit clip stays on (checked over every lap so skipped ticks still count)
+    tire_wear = session_engine(current_tick()).column("tire_wear")
+    pit_window = ((tire_wear > 65) & (tire_wear < 66)).any()
+    render_video("pit" if pit_window else "lap", st.empty())
+
+
+@st.fragment(run_every=refresh_interval)
+def strategy_fragment():
+    tick = current_tick()
+    state = race_state(tick)
+    fuel = state["fuel"]
+
+    # Sector splits for the lap just completed (none for a lap-only recording)
+    sector_timer = session_engine(tick).sectors
+    sectors_html = ""
+    if sector_timer is not None:
+        sector_status = sector_timer.status()[0]
+        sectors_html = " ".join(
+            f'<span style="color:{SECTOR_STATUS_COLORS.get(status, "#f1c40f")};">S{index + 1} {split:.2f}</span>'
+            for index, (split, status) in enumerate(zip(sector_timer.splits[0], sector_status))
+        )
+
     # Strategy decision with inline fuel icon
-    decision, color = get_decision(tire_wear, lap_delta)
     fuel_level_class = "high" if fuel > 60 else "medium" if fuel > 25 else "low"
     fuel_height = max(3, (fuel / 100) * 32)  # 32px is the usable height inside the icon
     
-    decision_card.markdown(
+    st.markdown(
         f"""
         <div class="panel">
             <div class="panel-title">STRATEGY DECISION</div>
             <div style="padding: 1rem; text-align: center;">
-                <h2 style="color:{color}; font-family: 'Orbitron', monospace; margin-bottom: 1rem; font-size: 1.5rem;">{decision}</h2>
-                <p style="color:#f1faee; font-size: 1.1rem; margin: 0.5rem 0;">Lap: {lap}</p>
-                <p style="color:#a8dadc; font-size: 1rem; margin: 0.5rem 0;">Tire Wear: {tire_wear:.1f}%</p>
+                <h2 style="color:{state['color']}; font-family: 'Orbitron', monospace; margin-bottom: 1rem; font-size: 1.5rem;">{state['decision']}</h2>
+                <p style="color:#a8dadc; font-size: 0.95rem; margin: 0.5rem 0;">{state['option']} &middot; {state['confidence']:.0%} confidence</p>
+                <p style="color:#f1faee; font-size: 1.1rem; margin: 0.5rem 0;">Lap: {state['lap']}</p>
+                <p style="color:#a8dadc; font-size: 1rem; margin: 0.5rem 0;">Tire Wear: {state['tire_wear']:.1f}%</p>
+                <p style="color:#a8dadc; font-size: 0.95rem; margin: 0.5rem 0;">Deg: +{state['degradation']:.2f} s/lap &middot; Fuel-corrected: {state['corrected_pace']:.2f}s</p>
+                <p style="font-family: 'Orbitron', monospace; font-size: 0.85rem; margin: 0.5rem 0;">{sectors_html}</p>
                 <div class="fuel-inline-container" style="justify-content: center;">
                     <span class="fuel-label">Fuel: {fuel:.1f}%</span>
                     <div class="fuel-icon-clean">
@@ -735,118 +717,167 @@ for i in range(len(df)):
         """,
         unsafe_allow_html=True
     )
-    
+
+    # Place Lap Time Trend directly under the decision card
+    st.markdown('<div class="panel"><div class="panel-title">LAP TIME TREND</div>', unsafe_allow_html=True)
+    engine = session_engine(tick)
+    # Only the laps completed since the last tick are sent to the browser, and
+    # long races are min/max-downsampled to the panel's width
+    render_lap_chart(engine.column("lap"), engine.column("lap_time"), key="lap_chart", height=220,
+                     pixel_width=lap_chart_pixels)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+# Default coordinates (Austin, TX). Change to track coordinates if known.
+_weather_lat, _weather_lon = 30.2672, -97.7431
+
+# Instantiate WeatherClient if available (graceful fallback to mock data)
+_wc = None
+if WeatherClient:
+    try:
+        _wc = WeatherClient(selected_date=datetime.date.today().isoformat())
+    except Exception:
+        _wc = None
+
+@st.cache_data(ttl=weather_interval, show_spinner=False)
+def _get_weather_snapshot():
+    """Return weather dict with either real data or a mock snapshot (shared for ``weather_interval`` s)."""
+    if _wc:
+        try:
+            epochs = _wc.generate_target_epochs(1)
+            target_epoch = int(epochs[0])
+            res = _wc.get_weather_at_time(_weather_lat, _weather_lon, target_epoch)
+        except Exception as e:
+            res = {"error": "exception", "message": str(e)}
+    else:
+        # Mock data when WeatherClient / network isn't available
+        res = {"current": {"temp": 22.4, "humidity": 56.0, "wind_speed": 3.5, "wind_dir": 135.0, "precip": 0.0, "pressure": 1013.5}}
+    return res
+
+
+@st.fragment(run_every=weather_interval)
+def weather_fragment():
+    res = _get_weather_snapshot()
+    if "error" not in res:
+        st.session_state.current_weather = res["current"].get("temp", 0)
+    st.markdown(weather_panel_html(res), unsafe_allow_html=True)
+
+
+@st.fragment(run_every=refresh_interval)
+def speed_trace_fragment():
+    # Latest lap against the fastest lap so far, aligned by distance
+    tick = current_tick()
+    best_lap = int(np.argmin(session_engine(tick).column("lap_time")))
+    channels = recording if recording is not None else race_lap_channels(laps)
+    render_speed_trace_panel(channels, car=0, lap=tick, best_lap=best_lap)
+
+
+@st.fragment
+def commentary_fragment():
+    # Reruns only on its own widgets; the race state is read at click time
+    state = race_state(current_tick())
+
     # Store current race data in session state for commentary
-    st.session_state.current_lap = lap
-    st.session_state.current_lap_time = lap_time
-    st.session_state.current_tire_wear = tire_wear
-    st.session_state.current_fuel = fuel
-    st.session_state.current_decision = decision
-    st.session_state.current_weather = _cur.get('temp', 0) if '_cur' in locals() else 22.4
-    
-    # Update commentary button in the loop (no page refresh)
-    with commentary_button_placeholder.container():
-        # Initialize session state for commentary if not exists
-        if 'commentary_generated' not in st.session_state:
-            st.session_state.commentary_generated = False
-        if 'commentary_text' not in st.session_state:
-            st.session_state.commentary_text = ""
-        if 'commentary_audio' not in st.session_state:
-            st.session_state.commentary_audio = None
-        if 'show_commentary' not in st.session_state:
-            st.session_state.show_commentary = False
-            
-        # Create columns for button and status
-        col1, col2 = st.columns([3, 1])
-        
-        with col1:
-            if st.button("🎙️ Generate Live Commentary", help="Click to generate AI commentary for current race state", use_container_width=True, key=f"commentary_btn_{i}"):
-                if gemini_key and elevenlabs_key and gemini_key != "your_gemini_api_key_here" and elevenlabs_key != "your_elevenlabs_api_key_here":
-                    # Store current race state for async processing
-                    st.session_state.current_race_stats = {
-                        'lap': lap,
-                        'lap_time': lap_time,
-                        'tire_wear': tire_wear,
-                        'fuel': fuel,
-                        'decision': decision,
-                        'weather': _cur.get('temp', 0) if '_cur' in locals() else 22.4
-                    }
-                    
-                    # Generate commentary without blocking
-                    with st.spinner("Generating commentary..."):
-                        commentary_text = commentary_system.generate_commentary(st.session_state.current_race_stats)
-                        if commentary_text and not commentary_text.startswith("Error"):
-                            st.session_state.commentary_text = commentary_text
-                            
-                            # Generate audio
-                            commentary_audio = commentary_system.text_to_speech(commentary_text)
-                            if commentary_audio:
-                                st.session_state.commentary_audio = commentary_audio
-                            
-                            st.session_state.commentary_generated = True
-                            st.session_state.show_commentary = True
-                            st.rerun()
-                        else:
-                            st.error("Failed to generate commentary text")
-                else:
-                    st.warning("Please configure your API keys in the .env file!")
+    st.session_state.current_lap = state["lap"]
+    st.session_state.current_lap_time = state["lap_time"]
+    st.session_state.current_tire_wear = state["tire_wear"]
+    st.session_state.current_fuel = state["fuel"]
+    st.session_state.current_decision = state["decision"]
+
+    # Initialize session state for commentary if not exists
+    if 'commentary_generated' not in st.session_state:
+        st.session_state.commentary_generated = False
+    if 'commentary_text' not in st.session_state:
+        st.session_state.commentary_text = ""
+    if 'commentary_audio' not in st.session_state:
+        st.session_state.commentary_audio = None
+    if 'show_commentary' not in st.session_state:
+        st.session_state.show_commentary = False
         
-        with col2:
-            if st.session_state.get('show_commentary', False):
-                if st.button("❌", help="Close commentary", key=f"close_commentary_{i}"):
-                    st.session_state.show_commentary = False
-                    st.session_state.commentary_generated = False
-                    st.rerun()
-        
-        # Display commentary if generated
-        if st.session_state.get('show_commentary', False) and st.session_state.get('commentary_text', ""):
-            st.markdown("**📝 Live Commentary:**")
-            with st.container():
-                st.info(st.session_state.commentary_text)
+    # Create columns for button and status
+    col1, col2 = st.columns([3, 1])
+    
+    with col1:
+        if st.button("🎙️ Generate Live Commentary", help="Click to generate AI commentary for current race state", use_container_width=True, key="commentary_btn"):
+            if gemini_key and elevenlabs_key and gemini_key != "your_gemini_api_key_here" and elevenlabs_key != "your_elevenlabs_api_key_here":
+                # Store current race state for async processing
+                st.session_state.current_race_stats = {
+                    'lap': state["lap"],
+                    'lap_time': state["lap_time"],
+                    'tire_wear': state["tire_wear"],
+                    'fuel': state["fuel"],
+                    'decision': state["decision"],
+                    'weather': st.session_state.get('current_weather', 22.4)
+                }
                 
-                if st.session_state.get('commentary_audio'):
-                    st.audio(st.session_state.commentary_audio, format="audio/mpeg")
-                    
-                # Auto-hide after showing (optional)
-                if st.button("🔄 Generate New Commentary", key=f"refresh_commentary_{i}"):
-                    st.session_state.show_commentary = False
-                    st.session_state.commentary_generated = False
-
-    # Video switching based on tire wear
-    if tire_wear > 65 and tire_wear < 66:
-        video_widget.empty()
-        render_video("Pit.mp4", video_widget)
-    #else:
-        ##video_widget.empty()
-        #render_video("F_Lap_Generation_Request.mp4", video_widget)
-
-        # Update weather snapshot each loop to keep it fresh
-    try:
-                _res = _get_weather_snapshot()
-                if "error" in _res:
-                        _body = f"<div class='panel'><div class='panel-title'>WEATHER</div><div class='panel-placeholder' style='min-height:120px;padding:12px;'>Error: {_res.get('message','unknown')}</div></div>"
-                else:
-                        _cur = _res["current"]
-                        _body = f'''
-                        <div class='panel'>
-                            <div class='panel-title'>WEATHER</div>
-                            <div style="padding:12px; min-height:120px; display:flex; gap:12px; align-items:center;">
-                                <div style="flex:0 0 110px; text-align:center;">
-                                    <div style="font-family: 'Orbitron', monospace; color:#59e1c6; font-size:48px; font-weight:700;">{_cur.get('temp', 0):.1f}°C</div>
-                                    <div style="font-family: 'Orbitron', monospace; color:#a8dadc; font-size:12px;">Current</div>
-                                </div>
-                                <div style="flex:1;">
-                                    <div style="font-family: 'Orbitron', monospace; color:#a8dadc; font-size:14px;">Humidity: <strong style='color:#f1faee'>{_cur.get('humidity', 0):.0f}%</strong></div>
-                                    <div style="font-family: 'Orbitron', monospace; color:#a8dadc; font-size:14px;">Wind: <strong style='color:#f1faee'>{_cur.get('wind_speed', 0):.1f} m/s</strong> @ {_cur.get('wind_dir', 0):.0f}°</div>
-                                    <div style="font-family: 'Orbitron', monospace; color:#a8dadc; font-size:14px;">Precip: <strong style='color:#f1faee'>{_cur.get('precip', 0):.1f} mm</strong></div>
-                                    <div style="font-family: 'Orbitron', monospace; color:#a8dadc; font-size:14px;">Pressure: <strong style='color:#f1faee'>{_cur.get('pressure', 0):.0f} hPa</strong></div>
-                                </div>
-                            </div>
-                        </div>
-                        '''
-                weather_widget.markdown(_body, unsafe_allow_html=True)
-    except Exception:
-                # Swallow rendering errors to avoid breaking simulation loop
-                pass
+                # Generate commentary without blocking
+                with st.spinner("Generating commentary..."):
+                    commentary_text = commentary_system.generate_commentary(st.session_state.current_race_stats)
+                    if commentary_text and not commentary_text.startswith("Error"):
+                        st.session_state.commentary_text = commentary_text
+                        
+                        # Generate audio
+                        commentary_audio = commentary_system.text_to_speech(commentary_text)
+                        if commentary_audio:
+                            st.session_state.commentary_audio = commentary_audio
+                        
+                        st.session_state.commentary_generated = True
+                        st.session_state.show_commentary = True
+                        st.rerun(scope="fragment")
+                    else:
+                        st.error("Failed to generate commentary text")
+            else:
+                st.warning("Please configure your API keys in the .env file!")
+    
+    with col2:
+        if st.session_state.get('show_commentary', False):
+            if st.button("❌", help="Close commentary", key="close_commentary"):
+                st.session_state.show_commentary = False
+                st.session_state.commentary_generated = False
+                st.rerun(scope="fragment")
+    
+    # Display commentary if generated
+    if st.session_state.get('show_commentary', False) and st.session_state.get('commentary_text', ""):
+        st.markdown("**📝 Live Commentary:**")
+        with st.container():
+            st.info(st.session_state.commentary_text)
+            
+            if st.session_state.get('commentary_audio'):
+                st.audio(st.session_state.commentary_audio, format="audio/mpeg")
+                
+            # Auto-hide after showing (optional)
+            if st.button("🔄 Generate New Commentary", key="refresh_commentary"):
+                st.session_state.show_commentary = False
+                st.session_state.commentary_generated = False
+                st.rerun(scope="fragment")
+
+
+# ----- Layout: three-column dashboard mirroring target UI -----
+left_col, center_col, right_col = st.columns([1.2, 1.6, 1.2])
 
-    time.sleep(update_interval)
+with left_col:
+    # Race Status (Track View)
+    track_fragment()
+
+    # Live camera video
+    video_fragment()
+
+with center_col:
+    # Car visualization from Elements folder
+    render_car_panel()
+
+    # Live Commentary button under the car image
+    st.markdown('<div class="panel"><div class="panel-title">AI COMMENTARY</div>', unsafe_allow_html=True)
+    commentary_fragment()
+    st.markdown('</div>', unsafe_allow_html=True)
+
+    # Speed trace of the latest lap against the best lap; lap-only recordings have no trace
+    if recording is None or recording.sample_channels:
+        speed_trace_fragment()
+
+with right_col:
+    # Strategy decision card sits at the top, lap time trend under it
+    strategy_fragment()
+
+    # Weather section moved to right side
+    weather_fragment()
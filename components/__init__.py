@@ -4,14 +4,27 @@ Components package for the Race Strategy Dashboard.
 This package contains modular components for different visualization features:
 - track_visualization: Track and car position visualization
 - car_visualization: Car image with interactive tire hotspots
+- lap_chart: Lap time chart that appends new points instead of redrawing
+- speed_trace: Speed trace of one lap overlaid on a reference lap
+- assets: Static image and video URLs and resized variants
 """
 
-from .track_visualization import create_track_plot, render_track_panel
+from .track_visualization import create_track_plot, render_track_view, render_track_panel
 from .car_visualization import render_car_visualization, render_car_panel
+from .lap_chart import render_lap_chart
+from .speed_trace import render_speed_trace_panel
+from .assets import asset_path, clips, static_file_url, static_image_url
 
 __all__ = [
     'create_track_plot',
+    'render_track_view',
     'render_track_panel', 
     'render_car_visualization',
-    'render_car_panel'
+    'render_car_panel',
+    'render_lap_chart',
+    'render_speed_trace_panel',
+    'asset_path',
+    'clips',
+    'static_file_url',
+    'static_image_url'
 ]
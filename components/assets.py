@@ -0,0 +1,200 @@
+"""
+Shared registry for image assets used in the dashboard HTML.
+
+Images are served by URL from Streamlit's static route (``static/`` next to
+app.py, enabled in .streamlit/config.toml). ``static_image_url`` writes a
+downscaled, content-hashed variant once per process, so browsers can cache it
+and reruns only resend the URL.
+
+Video clips are registered by name and published to the same route without
+being read into memory (hard-linked when possible), so the browser can stream
+and seek them with HTTP range requests.
+
+Custom components load plotly.js from their own directory, linked from the
+installed plotly package by ``component_plotly_js``, so they need no CDN and
+draw with the same plotly.js version the Python figures are built for.
+"""
+
+import hashlib
+import io
+import os
+import shutil
+import threading
+from functools import lru_cache
+from importlib import resources
+from pathlib import Path
+
+try:
+    from PIL import Image
+except Exception:
+    Image = None
+
+# Repository root: asset paths are resolved from here, not from the cwd
+ASSET_ROOT = Path(__file__).resolve().parent.parent
+
+# Streamlit serves files in STATIC_DIR under STATIC_URL_PREFIX
+STATIC_DIR = ASSET_ROOT / "static"
+GENERATED_DIR = STATIC_DIR / "generated"
+STATIC_URL_PREFIX = "app/static"
+
+
+def asset_path(*parts):
+    """Absolute path of an asset given relative to the repository root."""
+    return ASSET_ROOT.joinpath(*parts)
+
+
+def _encode_variant(source, max_width):
+    """Return (bytes, suffix) for a width-limited WebP, or the original file without Pillow."""
+    if Image is None:
+        return source.read_bytes(), source.suffix
+
+    with Image.open(source) as image:
+        if max_width and image.width > max_width:
+            height = round(image.height * max_width / image.width)
+            image = image.resize((max_width, height), Image.LANCZOS)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA")
+        buffer = io.BytesIO()
+        image.save(buffer, format="WEBP", quality=85, method=6)
+    return buffer.getvalue(), ".webp"
+
+
+@lru_cache(maxsize=None)
+def _static_variant(source, mtime_ns, max_width):
+    """Build one variant of an asset; cached per (path, mtime, width) for the process."""
+    source = Path(source)
+    data, suffix = _encode_variant(source, max_width)
+    digest = hashlib.sha256(data).hexdigest()[:12]
+    width_tag = f".w{max_width}" if max_width else ""
+    name = f"{source.stem}{width_tag}.{digest}{suffix}"
+
+    target = GENERATED_DIR / name
+    if not target.exists():
+        GENERATED_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_name(f".{name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, target)
+    return f"{STATIC_URL_PREFIX}/generated/{name}"
+
+
+def static_image_url(image_path, max_width=None):
+    """
+    Return a cacheable URL for an image, generating a resized variant if needed.
+
+    The file name carries a hash of the variant's bytes, so a changed source
+    produces a new URL and old URLs never go stale.
+
+    Args:
+        image_path: Source image; relative paths resolve from ASSET_ROOT
+        max_width: Largest width in pixels, or None to keep the source size
+
+    Returns:
+        URL relative to the app root, for use in ``src`` attributes
+    """
+    path = Path(image_path)
+    if not path.is_absolute():
+        path = ASSET_ROOT / path
+    path = path.resolve()
+    return _static_variant(str(path), path.stat().st_mtime_ns, max_width)
+
+
+def _link_or_copy(source, target):
+    """Atomically place ``source`` at ``target``, hard-linked when possible."""
+    tmp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    try:
+        os.link(source, tmp_path)
+    except OSError:
+        # Different filesystem or no hard-link support
+        shutil.copy2(source, tmp_path)
+    os.replace(tmp_path, target)
+
+
+@lru_cache(maxsize=None)
+def _published_file(source, mtime_ns, size):
+    """Expose a file on the static route; cached per (path, mtime, size) for the process."""
+    source = Path(source)
+    # Named from the file's identity, not its bytes, so large clips are never read
+    digest = hashlib.sha256(f"{source}:{mtime_ns}:{size}".encode()).hexdigest()[:12]
+    name = f"{source.stem}.{digest}{source.suffix}"
+
+    target = GENERATED_DIR / name
+    if not target.exists():
+        GENERATED_DIR.mkdir(parents=True, exist_ok=True)
+        _link_or_copy(source, target)
+    return f"{STATIC_URL_PREFIX}/generated/{name}"
+
+
+def static_file_url(file_path):
+    """
+    Return a cacheable URL for a file served unchanged from the static route.
+
+    Args:
+        file_path: Source file; relative paths resolve from ASSET_ROOT
+
+    Returns:
+        URL relative to the app root, for use in ``src`` attributes
+    """
+    path = Path(file_path)
+    if not path.is_absolute():
+        path = ASSET_ROOT / path
+    path = path.resolve()
+    stat = path.stat()
+    return _published_file(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=None)
+def component_plotly_js(renderer_dir):
+    """
+    Put the installed plotly package's plotly.js next to a component, once per process.
+
+    Components are served from their own directory, so the script loads from
+    the app's origin and works offline or under a strict CSP.
+
+    Args:
+        renderer_dir: Directory passed to ``declare_component``
+
+    Returns:
+        Path of the script relative to the component's index.html
+    """
+    source = Path(resources.files("plotly") / "package_data" / "plotly.min.js")
+    relative = "generated/plotly.min.js"
+    target = Path(renderer_dir) / relative
+    # Replaced whenever the plotly package is upgraded
+    current = target.exists() and (target.stat().st_size, target.stat().st_mtime_ns) == (
+        source.stat().st_size, source.stat().st_mtime_ns)
+    if not current:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        _link_or_copy(source, target)
+    return relative
+
+
+class ClipRegistry:
+    """Thread-safe map of clip names to video files, shared by every session."""
+
+    def __init__(self):
+        self._paths = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, path):
+        """Register (or replace) the file played for clip ``name``."""
+        with self._lock:
+            self._paths[name] = Path(path)
+
+    def names(self):
+        with self._lock:
+            return sorted(self._paths)
+
+    def url(self, name):
+        """
+        Return the static URL of a registered clip.
+
+        Raises:
+            KeyError: If no clip is registered under ``name``
+            FileNotFoundError: If the clip's file is missing
+        """
+        with self._lock:
+            path = self._paths[name]
+        return static_file_url(path)
+
+
+clips = ClipRegistry()
@@ -1,11 +1,8 @@
 import streamlit as st
-import base64
-from pathlib import Path
+from .assets import asset_path, static_image_url
 
-def get_image_base64(image_path):
-    """Encode image to base64 for embedding in HTML."""
-    with open(image_path, "rb") as img_file:
-        return base64.b64encode(img_file.read()).decode()
+# Largest width the car image is served at (about 2x the panel on high-DPI screens)
+CAR_IMAGE_WIDTH = 800
 
 def create_car_css():
     """
@@ -71,17 +68,17 @@ def render_car_visualization():
     st.markdown(create_car_css(), unsafe_allow_html=True)
     
     # Find car image
-    car_path = Path("Elements") / "Car.png"
+    car_path = asset_path("Elements", "Car.png")
     if not car_path.exists():
-        alt_path = Path("Elements") / "HackTX F-1 Car-Photoroom.png"
+        alt_path = asset_path("Elements", "HackTX F-1 Car-Photoroom.png")
         if alt_path.exists():
             car_path = alt_path
     
     if car_path.exists():
-        car_b64 = get_image_base64(car_path)
+        car_url = static_image_url(car_path, max_width=CAR_IMAGE_WIDTH)
         return f'''
         <div class="car-frame">
-            <img class="car-img" src="data:image/png;base64,{car_b64}" alt="car"/>
+            <img class="car-img" src="{car_url}" alt="car"/>
             <div class="hotspot hotspot-fl"><div class="tooltip">Front Left Tire</div></div>
             <div class="hotspot hotspot-fr"><div class="tooltip">Front Right Tire</div></div>
             <div class="hotspot hotspot-rl"><div class="tooltip">Rear Left Tire</div></div>
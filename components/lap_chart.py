@@ -0,0 +1,120 @@
+from pathlib import Path
+
+import numpy as np
+import streamlit as st
+import streamlit.components.v1 as components
+
+from simulation.downsampling import bucket_size_for, lttb_indices, minmax_indices
+
+from .assets import component_plotly_js
+
+# Browser-side chart that keeps its figure and only appends new points
+_RENDERER_DIR = Path(__file__).parent / "lap_chart_renderer"
+_lap_chart_renderer = components.declare_component("lap_chart_renderer", path=str(_RENDERER_DIR))
+component_plotly_js(_RENDERER_DIR)
+
+# Above this many points the trace is switched to WebGL (Scattergl)
+DEFAULT_WEBGL_THRESHOLD = 2000
+
+LAP_CHART_TRACE = dict(
+    type="scatter",
+    mode="lines+markers",
+    name="Lap Time",
+    line=dict(color="#4ecdc4", width=3),
+    marker=dict(color="#ff6b6b", size=8),
+)
+
+LAP_CHART_LAYOUT = dict(
+    yaxis=dict(title=dict(text="Lap Time (s)"), gridcolor="rgba(255,255,255,0.1)"),
+    xaxis=dict(title=dict(text="Lap"), gridcolor="rgba(255,255,255,0.1)"),
+    plot_bgcolor="rgba(0,0,0,0)",
+    paper_bgcolor="rgba(0,0,0,0)",
+    font=dict(family="Orbitron, monospace", color="#f1faee"),
+    margin=dict(l=60, r=20, t=20, b=50),
+    showlegend=False,
+)
+
+
+def _downsample(x, y, pixel_width, method):
+    """
+    Reduce a series for a chart ``pixel_width`` pixels wide.
+
+    Returns:
+        Tuple (x, y, bucket, final): the reduced series, a tag for the
+        bucketing in use, and how many leading points later appends will
+        never change
+    """
+    if not pixel_width or len(y) <= 2 * pixel_width:
+        return x, y, 1, len(y)
+    if method == "lttb":
+        indices = lttb_indices(x, y, 2 * pixel_width)
+        return x[indices], y[indices], "lttb", 0
+    bucket = bucket_size_for(len(y), pixel_width)
+    indices, final = minmax_indices(y, bucket)
+    return x[indices], y[indices], bucket, final
+
+
+def render_lap_chart(x, y, key="lap_chart", height=220, webgl_threshold=DEFAULT_WEBGL_THRESHOLD,
+                     max_points=None, pixel_width=None, downsample="minmax", trace=None, layout=None):
+    """
+    Draw a growing series, sending only the points the browser does not have.
+
+    The first render ships the layout, trace style and every point; later
+    renders ship the new points only, which the browser appends with
+    ``Plotly.extendTraces``, so a tick costs the same on lap 10 and lap
+    10,000. If the browser misses an update (or the chart remounts) it asks
+    for the points from its own count onward and the next run resends them.
+
+    With ``pixel_width`` set, series longer than two points per pixel are
+    downsampled first. Min/max buckets (the default) keep every peak and
+    trough and only the last bucket is resent per tick; the bucket size
+    doubles as the series grows, which resends the whole (bounded) series.
+    LTTB keeps the line's shape with one point per bucket but is resent in
+    full each tick.
+
+    Args:
+        x: Every x value of the series so far (e.g. a TelemetryStore view)
+        y: Every y value of the series so far
+        key: Streamlit element key, one per chart
+        height: Frame height in pixels
+        webgl_threshold: Point count above which the trace becomes Scattergl
+        max_points: Keep only the latest points in the browser, or None for all
+        pixel_width: Plot width to downsample for, or None to send every point
+        downsample: "minmax" or "lttb"
+        trace: Overrides for ``LAP_CHART_TRACE``
+        layout: Overrides for ``LAP_CHART_LAYOUT``
+    """
+    # Points of the last render that no later render changes, and its bucketing
+    final_key = f"_{key}_final"
+    bucket_key = f"_{key}_bucket"
+    handled_key = f"_{key}_resync"
+    first_render = final_key not in st.session_state
+    start = st.session_state.get(final_key, 0)
+
+    # The component's value is the browser's resync request, if it made one
+    request = st.session_state.get(key)
+    resync = bool(request) and request.get("request") != st.session_state.get(handled_key)
+    if resync:
+        st.session_state[handled_key] = request["request"]
+        start = min(int(request["have"]), start)
+
+    x, y, bucket, final = _downsample(np.asarray(x), np.asarray(y), pixel_width, downsample)
+    if bucket != st.session_state.get(bucket_key, 1) or start > len(y):
+        # New bucket size, or the series was restarted
+        start = 0
+
+    args = dict(
+        offset=start,
+        x=x[start:].tolist(),
+        y=y[start:].tolist(),
+        height=height,
+        webgl_threshold=webgl_threshold,
+        max_points=max_points,
+    )
+    if start == 0 and (first_render or resync):
+        args["trace"] = {**LAP_CHART_TRACE, **(trace or {})}
+        args["layout"] = {**LAP_CHART_LAYOUT, **(layout or {}), "height": height}
+
+    _lap_chart_renderer(**args, key=key, default=None)
+    st.session_state[final_key] = final
+    st.session_state[bucket_key] = bucket
@@ -0,0 +1,74 @@
+import numpy as np
+import plotly.graph_objects as go
+import streamlit as st
+
+# Distance samples per trace: about one per pixel of the panel
+SPEED_TRACE_POINTS = 480
+
+
+def create_speed_trace_figure(distance, current, best, current_label, best_label, height=220):
+    """
+    Overlay of two speed traces aligned by distance.
+
+    Args:
+        distance: Common distance grid (metres)
+        current: Speed of the current lap at each grid point (km/h)
+        best: Speed of the reference lap at each grid point (km/h)
+        current_label: Legend text for the current lap
+        best_label: Legend text for the reference lap
+        height: Figure height in pixels
+
+    Returns:
+        Plotly figure object
+    """
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=distance,
+        y=best,
+        mode="lines",
+        name=best_label,
+        line=dict(color="#b388ff", width=2),
+    ))
+    fig.add_trace(go.Scatter(
+        x=distance,
+        y=current,
+        mode="lines",
+        name=current_label,
+        line=dict(color="#4ecdc4", width=2),
+    ))
+    fig.update_layout(
+        yaxis_title="Speed (km/h)",
+        xaxis_title="Distance (m)",
+        height=height,
+        margin=dict(l=60, r=20, t=20, b=50),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(family="Orbitron, monospace", color="#f1faee"),
+        xaxis=dict(gridcolor='rgba(255,255,255,0.1)'),
+        yaxis=dict(gridcolor='rgba(255,255,255,0.1)'),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+    )
+    return fig
+
+
+def render_speed_trace_panel(channels, car, lap, best_lap, key="speed_trace", points=SPEED_TRACE_POINTS):
+    """
+    Render the SPEED TRACE panel: one lap's speed against a reference lap.
+
+    Both laps are resampled onto the same distance grid in a single call, so
+    the payload is ``2 * points`` values however high the sample rate.
+
+    Args:
+        channels: LapChannels holding the car's samples
+        car: Car index
+        lap: Lap to show (0-based)
+        best_lap: Reference lap (0-based)
+        key: Streamlit element key
+        points: Distance samples per trace
+    """
+    st.markdown('<div class="panel"><div class="panel-title">SPEED TRACE</div>', unsafe_allow_html=True)
+    grid = np.linspace(0.0, channels.lap_length, points)
+    current, best = channels.align(car, [lap, best_lap], "speed", grid)
+    fig = create_speed_trace_figure(grid, current, best, f"Lap {lap + 1}", f"Best (Lap {best_lap + 1})")
+    st.plotly_chart(fig, use_container_width=True, key=key)
+    st.markdown('</div>', unsafe_allow_html=True)
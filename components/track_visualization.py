@@ -1,125 +1,127 @@
+import hashlib
+import os
+from functools import lru_cache
+from pathlib import Path
+
 import streamlit as st
+import streamlit.components.v1 as components
 import plotly.graph_objects as go
 import numpy as np
+from simulation import get_track_geometry
+from simulation.polyline import tolerance_for_pixels
+
+from .assets import component_plotly_js
+
+# Browser-side renderer that keeps the static layers and patches car markers
+_RENDERER_DIR = Path(__file__).parent / "track_renderer"
+_track_renderer = components.declare_component("track_renderer", path=str(_RENDERER_DIR))
+component_plotly_js(_RENDERER_DIR)
+
+SECTOR_COLORS = ("#ff6b6b", "#4ecdc4", "#f1c40f")
 
-def create_track_plot(lap, laps, radius=100):
+# Panel sizes (pixels along the shorter side) that get their own detail level.
+# The browser picks the smallest level that covers its actual size.
+LOD_PIXEL_SIZES = (480, 960, 1920)
+
+
+def create_car_trace(car_x, car_y, labels, colors="#ff6b6b"):
     """
-    Create a realistic F1-style track visualization with turns and optimal racing line.
-    
+    Single WebGL marker trace for the whole field.
+
+    One trace regardless of field size keeps figure serialization and browser
+    redraw flat as cars are added. It is kept last so it draws above the
+    track layers.
+    """
+    return go.Scattergl(
+        x=car_x, 
+        y=car_y, 
+        mode="markers", 
+        marker=dict(
+            size=20, 
+            color=colors, 
+            line=dict(width=3, color="white"),
+            symbol="circle"
+        ), 
+        name="Car",
+        hovertemplate="Car Position<br>%{text}<extra></extra>",
+        text=labels
+    )
+
+
+def car_markers(geometry, cars):
+    """
+    Compute marker data for a field of car states in one vectorized pass.
+
     Args:
-        lap: Current lap number
-        laps: Total number of laps
-        radius: Track radius (not used for new track)
-    
+        geometry: TrackGeometry the cars are on
+        cars: Sequence of dicts with ``progress`` (laps, only the fractional
+            part sets the position), and optional ``color`` and ``label``
+
     Returns:
-        Plotly figure object
+        Dict of JSON-ready lists: x, y, color, text
+    """
+    progress = np.fromiter((car["progress"] for car in cars), dtype=float, count=len(cars))
+    x, y = geometry.position_at_fraction(progress)
+    return {
+        "x": np.round(x, 2).tolist(),
+        "y": np.round(y, 2).tolist(),
+        "color": [car.get("color", "#ff6b6b") for car in cars],
+        "text": [car.get("label", "") for car in cars],
+    }
+
+
+def lap_animation_frames(geometry, cars, advance, duration, fps=30):
     """
-    # Create a simple, compact F1-style track layout matching the image
-    def create_track_layout():
-        """Create a smooth Circuit of the Americas-style circular track layout."""
-        # Define the angular path for a looping track with varied turns
-        theta = np.linspace(0, 2 * np.pi, 600)
+    Precompute marker positions for a client-side animation.
 
-        # Base radius variation to create a more dynamic track
-        r = 100 + 10 * np.sin(3 * theta) + 5 * np.sin(6 * theta)
+    Every frame for every car comes from one position lookup over a
+    (frames, cars) grid of lap fractions; the browser plays the frames back
+    and interpolates between them, so the server sends one message per
+    animation instead of one figure per position.
 
-        # Convert polar to cartesian
-        x = r * np.cos(theta)
-        y = r * np.sin(theta)
+    Args:
+        geometry: TrackGeometry the cars are on
+        cars: Car states at the start of the animation (see ``car_markers``)
+        advance: Laps each car covers during the animation (scalar or per car)
+        duration: Playback length in seconds
+        fps: Frames per second to sample
 
-        # Add "COTA-like" character: tighter esses and long straight
-        # Create an S-section between angles 0.3π to 0.7π
-        mask = (theta > 0.3 * np.pi) & (theta < 0.7 * np.pi)
-        y[mask] += 25 * np.sin(8 * theta[mask])
+    Returns:
+        Dict with fps, duration and per-frame x/y lists of shape (frames, cars)
+    """
+    progress = np.fromiter((car["progress"] for car in cars), dtype=float, count=len(cars))
+    advance = np.broadcast_to(np.asarray(advance, dtype=float), progress.shape)
+    n_frames = max(2, int(round(duration * fps)) + 1)
+    t = np.linspace(0.0, 1.0, n_frames)[:, None]
+    x, y = geometry.position_at_fraction(progress[None, :] + t * advance[None, :])
+    return {
+        "fps": (n_frames - 1) / duration if duration > 0 else fps,
+        "duration": duration,
+        "x": np.round(x, 2).tolist(),
+        "y": np.round(y, 2).tolist(),
+    }
 
-        # Simulate a long straight at the back of the circuit
-        mask_straight = (theta > 1.1 * np.pi) & (theta < 1.4 * np.pi)
-        x[mask_straight] = np.linspace(80, -80, mask_straight.sum())
 
-        # Close the loop cleanly
-        x[-1] = x[0]
-        y[-1] = y[0]
+def _single_car(lap, laps):
+    """Car state for the classic one-car view, where a lap of the map is the whole race."""
+    return [{"progress": (lap % laps) / laps if laps > 0 else 0, "label": f"Lap: {lap}"}]
 
-        return x, y
 
+def create_static_track_figure(geometry, tolerance=0.0):
+    """
+    Build the track figure without any car: outline, racing line, sectors,
+    DRS zones and speed trap. These layers only depend on the geometry.
     
-    def create_optimal_racing_line(track_x, track_y):
-        """Create an optimal racing line that follows the track geometry accurately"""
-        racing_line_x = []
-        racing_line_y = []
-        
-        # Smooth the track first for better racing line calculation
-        from scipy.ndimage import gaussian_filter1d
-        
-        # Apply smoothing to get better derivatives
-        smooth_x = gaussian_filter1d(track_x, sigma=2)
-        smooth_y = gaussian_filter1d(track_y, sigma=2)
-        
-        for i in range(len(smooth_x)):
-            # Calculate tangent vector (direction of track)
-            if i < len(smooth_x) - 1:
-                dx = smooth_x[i+1] - smooth_x[i]
-                dy = smooth_y[i+1] - smooth_y[i]
-            else:
-                dx = smooth_x[0] - smooth_x[i]
-                dy = smooth_y[0] - smooth_y[i]
-            
-            # Calculate normal vector (perpendicular to track direction)
-            length = np.sqrt(dx**2 + dy**2)
-            if length > 0:
-                # Normal vector (rotated 90 degrees)
-                nx = -dy / length
-                ny = dx / length
-                
-                # Dynamic offset based on track curvature
-                # In turns, stay closer to the inside; on straights, use more of the track
-                curvature = abs(dx * dy) / (length + 1e-6)  # Simple curvature measure
-                base_offset = 6  # Base offset for track width
-                dynamic_offset = base_offset * (1 - 0.3 * curvature)  # Reduce offset in turns
-                
-                racing_line_x.append(smooth_x[i] + nx * dynamic_offset)
-                racing_line_y.append(smooth_y[i] + ny * dynamic_offset)
-            else:
-                racing_line_x.append(smooth_x[i])
-                racing_line_y.append(smooth_y[i])
-        
-        return racing_line_x, racing_line_y
-    
-    def get_car_position(lap, laps, track_x, track_y):
-        """Get car position along the track with smooth movement"""
-        # Calculate position along track
-        progress = (lap % laps) / laps if laps > 0 else 0
-        total_points = len(track_x)
-        
-        # Use interpolation for smoother movement
-        position_index = progress * (total_points - 1)
-        
-        # Handle wrapping around the track
-        if position_index >= total_points:
-            position_index = position_index % total_points
-        
-        # Get the exact position (can be fractional)
-        if position_index < total_points - 1:
-            # Interpolate between two points for smoother movement
-            idx1 = int(position_index)
-            idx2 = idx1 + 1
-            frac = position_index - idx1
-            
-            x = track_x[idx1] + frac * (track_x[idx2] - track_x[idx1])
-            y = track_y[idx1] + frac * (track_y[idx2] - track_y[idx1])
-        else:
-            # Handle the case where we're at the end
-            x = track_x[-1]
-            y = track_y[-1]
-        
-        return x, y
-    
-    # Create track layout
-    track_x, track_y = create_track_layout()
-    racing_line_x, racing_line_y = create_optimal_racing_line(track_x, track_y)
+    Args:
+        geometry: TrackGeometry to draw
+        tolerance: Line simplification tolerance in track units (0 = full detail)
     
-    # Get car position
-    car_x, car_y = get_car_position(lap, laps, track_x, track_y)
+    Returns:
+        Plotly figure object
+    """
+    level = geometry.lod(tolerance)
+    track_x, track_y = level["x"], level["y"]
+    racing_line_x, racing_line_y = level["racing_x"], level["racing_y"]
     
     # Create the plot
     fig = go.Figure()
@@ -144,96 +146,35 @@ def create_track_plot(lap, laps, radius=100):
         hovertemplate="Racing Line<br>%{x:.1f}, %{y:.1f}<extra></extra>"
     ))
     
-    # Add car position
-    fig.add_trace(go.Scatter(
-        x=[car_x], 
-        y=[car_y], 
-        mode="markers", 
-        marker=dict(
-            size=20, 
-            color="#ff6b6b", 
-            line=dict(width=3, color="white"),
-            symbol="circle"
-        ), 
-        name="Car",
-        hovertemplate="Car Position<br>Lap: %{text}<extra></extra>",
-        text=[f"{lap}"]
-    ))
-    
     # Add track sectors with proper colors (matching the image)
-    # Sector 1 (Red) - Turns 1-5
-    sector1_x = track_x[:150]  # First 150 points
-    sector1_y = track_y[:150]
-    fig.add_trace(go.Scatter(
-        x=sector1_x,
-        y=sector1_y,
-        mode="lines",
-        line=dict(color="#ff6b6b", width=6),
-        name="Sector 1",
-        showlegend=True,
-        hoverinfo="skip"
-    ))
-    
-    # Sector 2 (Blue) - Turns 6-11
-    sector2_x = track_x[150:300]  # Middle section
-    sector2_y = track_y[150:300]
-    fig.add_trace(go.Scatter(
-        x=sector2_x,
-        y=sector2_y,
-        mode="lines",
-        line=dict(color="#4ecdc4", width=6),
-        name="Sector 2",
-        showlegend=True,
-        hoverinfo="skip"
-    ))
-    
-    # Sector 3 (Yellow) - Turns 12-20
-    sector3_x = track_x[300:]  # Final section
-    sector3_y = track_y[300:]
-    fig.add_trace(go.Scatter(
-        x=sector3_x,
-        y=sector3_y,
-        mode="lines",
-        line=dict(color="#f1c40f", width=6),
-        name="Sector 3",
-        showlegend=True,
-        hoverinfo="skip"
-    ))
+    # Sector 1 (Red), Sector 2 (Blue), Sector 3 (Yellow)
+    for index, (sector_x, sector_y) in enumerate(level["sectors"]):
+        fig.add_trace(go.Scatter(
+            x=sector_x,
+            y=sector_y,
+            mode="lines",
+            line=dict(color=SECTOR_COLORS[index % len(SECTOR_COLORS)], width=6),
+            name=f"Sector {index + 1}",
+            showlegend=True,
+            hoverinfo="skip"
+        ))
     
     # Add DRS Detection Zones
-    # DRS Detection Zone 1 (before Turn 11)
-    drs1_x = [0, 5, 5, 0, 0]
-    drs1_y = [58, 58, 62, 62, 58]
-    fig.add_trace(go.Scatter(
-        x=drs1_x,
-        y=drs1_y,
-        mode="lines",
-        line=dict(color="#00ff00", width=3),
-        fill="toself",
-        fillcolor="rgba(0, 255, 0, 0.3)",
-        name="DRS Detection 1",
-        showlegend=True,
-        hoverinfo="skip"
-    ))
-    
-    # DRS Detection Zone 2 (before Turn 19)
-    drs2_x = [-2, 2, 2, -2, -2]
-    drs2_y = [62, 62, 65, 65, 62]
-    fig.add_trace(go.Scatter(
-        x=drs2_x,
-        y=drs2_y,
-        mode="lines",
-        line=dict(color="#00ff00", width=3),
-        fill="toself",
-        fillcolor="rgba(0, 255, 0, 0.3)",
-        name="DRS Detection 2",
-        showlegend=True,
-        hoverinfo="skip"
-    ))
+    for index, (drs_x, drs_y) in enumerate(geometry.drs_zones):
+        fig.add_trace(go.Scatter(
+            x=drs_x,
+            y=drs_y,
+            mode="lines",
+            line=dict(color="#00ff00", width=3),
+            fill="toself",
+            fillcolor="rgba(0, 255, 0, 0.3)",
+            name=f"DRS Detection {index + 1}",
+            showlegend=True,
+            hoverinfo="skip"
+        ))
     
     # Add Speed Trap
-    speed_trap_x = [-10, -5, -5, -10, -10]
-    speed_trap_y = [55, 55, 58, 58, 55]
+    speed_trap_x, speed_trap_y = geometry.speed_trap
     fig.add_trace(go.Scatter(
         x=speed_trap_x,
         y=speed_trap_y,
@@ -250,8 +191,8 @@ def create_track_plot(lap, laps, radius=100):
     fig.update_layout(
     height=600,
     margin=dict(l=10, r=10, t=10, b=10),
-    xaxis=dict(visible=False, range=[-130, 130]),
-    yaxis=dict(visible=False, range=[-130, 130]),
+    xaxis=dict(visible=False, range=list(geometry.view_range)),
+    yaxis=dict(visible=False, range=list(geometry.view_range)),
     plot_bgcolor='rgba(0,0,0,0)',
     paper_bgcolor='rgba(0,0,0,0)',
     font=dict(family="Orbitron, monospace", color="#f1faee"),
@@ -268,6 +209,108 @@ def create_track_plot(lap, laps, radius=100):
     
     return fig
 
+
+@lru_cache(maxsize=None)
+def _static_track_layers(track_name, pixels):
+    """
+    Write the static figure for a track next to the renderer, once per process.
+
+    Lines are simplified to half a pixel at the given panel size. The file
+    name carries a content hash, so browsers can cache it and every session
+    after the first loads it without another server round-trip.
+
+    Returns:
+        Path of the JSON file relative to the renderer's index.html
+    """
+    geometry = get_track_geometry(track_name)
+    span = geometry.view_range[1] - geometry.view_range[0]
+    tolerance = tolerance_for_pixels(span, pixels)
+    fig = create_static_track_figure(geometry, tolerance)
+    fig.add_trace(create_car_trace([], [], []))
+    payload = fig.to_json().encode()
+    digest = hashlib.sha256(payload).hexdigest()[:12]
+    relative = f"generated/{track_name}.{digest}.json"
+
+    path = _RENDERER_DIR / relative
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, path)
+    return relative
+
+
+def create_track_plot(lap, laps, cars=None, track="cota"):
+    """
+    Create a realistic F1-style track visualization with turns and optimal racing line.
+    
+    Args:
+        lap: Current lap number
+        laps: Total number of laps
+        cars: Optional car states (see ``car_markers``); defaults to one car
+            placed by ``lap / laps``
+        track: Track definition name
+    
+    Returns:
+        Plotly figure object
+    """
+    geometry = get_track_geometry(track)
+    fig = create_static_track_figure(geometry)
+
+    # Per-tick work is only the car position lookup
+    markers = car_markers(geometry, cars if cars is not None else _single_car(lap, laps))
+    fig.add_trace(create_car_trace(markers["x"], markers["y"], markers["text"], markers["color"]))
+    return fig
+
+
+def render_track_view(lap, laps, cars=None, track="cota", key="track_view", height=600,
+                      animate_seconds=None, advance=None, fps=30):
+    """
+    Draw the track through the incremental renderer.
+
+    The static layers are loaded by the browser from a cached file, at the
+    detail level matching the panel's pixel size; each call
+    only ships the car marker data, which is patched in place while the
+    renderer stays mounted under the same ``key``.
+
+    With ``animate_seconds`` set, the positions for the whole interval are
+    sent at once and the browser moves the cars smoothly until the next call.
+
+    Args:
+        lap: Current lap number
+        laps: Total number of laps
+        cars: Optional car states (see ``car_markers``); defaults to one car
+            placed by ``lap / laps``
+        track: Track definition name
+        key: Streamlit element key, one per track view
+        height: Frame height in pixels
+        animate_seconds: Length of the client-side animation, or None
+        advance: Laps covered per car during the animation; defaults to the
+            single-car step of ``1 / laps``
+        fps: Animation sample rate
+    """
+    geometry = get_track_geometry(track)
+    if cars is None:
+        cars = _single_car(lap, laps)
+    markers = car_markers(geometry, cars)
+
+    animation = None
+    if animate_seconds:
+        if advance is None:
+            advance = 1 / laps if laps > 0 else 0
+        animation = lap_animation_frames(geometry, cars, advance, animate_seconds, fps)
+        animation["id"] = f"{key}:{lap}"
+
+    _track_renderer(
+        static_urls=[[pixels, _static_track_layers(track, pixels)] for pixels in LOD_PIXEL_SIZES],
+        markers=markers,
+        animation=animation,
+        height=height,
+        key=key,
+        default=None,
+    )
+
+
 def render_track_panel():
     """
     Render the track visualization panel with title.
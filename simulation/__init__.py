@@ -0,0 +1,58 @@
+"""
+Simulation package for the Race Strategy Dashboard.
+
+This package holds the Streamlit-free race model used by the dashboard:
+- track_geometry: Cached circuit centerline, racing line and timing markers
+- racing_line: Vectorized tangents, normals, curvature and racing-line offsets
+- polyline: Ramer–Douglas–Peucker simplification for level-of-detail drawing
+- circuits: Circuit files (CSV/GeoJSON + metadata) compiled to a memory-mapped cache
+- sector_timing: Vectorized sector splits, lap times and running bests per car
+- race_clock: Drift-free tick schedule with frame skipping and playback speed
+- telemetry: Vectorized, seedable synthetic telemetry for N cars x M laps
+- telemetry_store: Columnar append/ring buffer with zero-copy window views
+- downsampling: LTTB and min/max bucketing to bound chart payloads
+- lap_channels: High-frequency channels indexed by lap and distance, with lap alignment
+- strategy: Vectorized Monte Carlo evaluation of pit stop options
+- degradation: Online (recursive least squares) tire degradation and fuel correction
+- engine: Headless RaceEngine stepping telemetry, lap-time model, sectors, strategy and weather
+- backtest: Vectorized scoring of pit-call threshold rules over recorded races
+- season: Headless multi-process season runner (``python -m simulation.season``)
+- replay: Chunked, memory-mapped race recordings with O(1) lap seeks (``python -m simulation.replay``)
+"""
+
+from .track_geometry import TrackGeometry, get_track_geometry
+from .circuits import available_circuits, load_circuit
+from .sector_timing import SectorTimer
+from .race_clock import RaceClock
+from .telemetry import generate_telemetry, iter_telemetry
+from .telemetry_store import TelemetryStore
+from .downsampling import lttb, minmax
+from .lap_channels import LapChannels, synthesize_lap_channels
+from .strategy import StrategyResult, simulate_strategies
+from .degradation import DegradationModel
+from .engine import RaceEngine
+from .backtest import backtest_thresholds, load_races, stack_races, synthetic_races
+
+__all__ = [
+    'TrackGeometry',
+    'get_track_geometry',
+    'available_circuits',
+    'load_circuit',
+    'SectorTimer',
+    'RaceClock',
+    'generate_telemetry',
+    'iter_telemetry',
+    'TelemetryStore',
+    'lttb',
+    'minmax',
+    'LapChannels',
+    'synthesize_lap_channels',
+    'StrategyResult',
+    'simulate_strategies',
+    'DegradationModel',
+    'RaceEngine',
+    'backtest_thresholds',
+    'load_races',
+    'stack_races',
+    'synthetic_races'
+]
@@ -0,0 +1,185 @@
+"""
+Backtesting pit-call rules against recorded races.
+
+Races are stacked into padded (races, cars, laps) arrays and flattened, so
+every lap of every car is one element and every stint is one contiguous
+segment. A rule's calls over the whole archive are a single boolean
+expression, and the first call in each stint is one ``reduceat``; a whole
+grid of thresholds is evaluated as one more array axis, in chunks that keep
+memory bounded.
+
+A rule is scored against the stop the team actually made at the end of each
+stint:
+
+- call error: laps between the rule's first PIT NOW call and the recorded
+  stop (negative = early). A rule that stays quiet until the stop is late; the
+  lap it would have called is extrapolated from the stint's wear rate.
+- time lost: an early call gives up the unused share of the set, costing that
+  share of a pit stop; a late call runs each extra lap on worn tires instead
+  of a new set, costing ``wear_time_cost * wear`` per lap. A call in a final
+  stint, where no stop was needed, costs a whole stop.
+"""
+
+import numpy as np
+
+from .telemetry import generate_telemetry
+
+# Channels a recorded race needs, shape (cars, laps)
+BACKTEST_CHANNELS = ("lap_time", "tire_wear", "pit", "stint")
+
+# Thresholds of the dashboard's original rule set
+DEFAULT_PIT_WEAR = 65.0
+DEFAULT_LAP_DELTA = 0.6
+DEFAULT_MONITOR_WEAR = 45.0
+
+
+def load_races(paths):
+    """
+    Load recorded races saved with ``np.savez`` (one race per file).
+
+    Args:
+        paths: Iterable of .npz paths, each holding BACKTEST_CHANNELS
+
+    Returns:
+        List of dicts of arrays
+    """
+    races = []
+    for path in paths:
+        with np.load(path) as data:
+            races.append({channel: data[channel] for channel in BACKTEST_CHANNELS})
+    return races
+
+
+def synthetic_races(n_races, n_cars=20, n_laps=60, seed=None, **model):
+    """Generate ``n_races`` independent races (one child seed each)."""
+    seeds = np.random.SeedSequence(seed).generate_state(n_races)
+    return [generate_telemetry(n_cars, n_laps, seed=int(s), **model) for s in seeds]
+
+
+def stack_races(races):
+    """
+    Pad races of any field size and length into common arrays.
+
+    Returns:
+        Dict of arrays of shape (races, cars, laps); padding has NaN lap
+        times and wear, no stops, and stint -1
+    """
+    n_cars = max(race["lap_time"].shape[0] for race in races)
+    n_laps = max(race["lap_time"].shape[1] for race in races)
+    fills = {"lap_time": np.nan, "tire_wear": np.nan, "pit": False, "stint": -1}
+    stacked = {}
+    for channel, fill in fills.items():
+        out = np.full((len(races), n_cars, n_laps), fill, dtype=np.asarray(fill).dtype)
+        for i, race in enumerate(races):
+            cars, laps = race[channel].shape
+            out[i, :cars, :laps] = race[channel]
+        stacked[channel] = out
+    return stacked
+
+
+def _stints(stacked):
+    """Flattened laps and the stint segments they fall into."""
+    lap_time = stacked["lap_time"]
+    delta = np.zeros_like(lap_time)
+    delta[..., 1:] = (lap_time[..., 1:] - lap_time[..., :-1]) / lap_time[..., :-1]
+    # A pit lap's time includes the stop itself, which would leak the answer
+    delta[stacked["pit"]] = 0.0
+
+    stint = stacked["stint"]
+    new_segment = np.ones(stint.shape, dtype=bool)
+    new_segment[..., 1:] = stint[..., 1:] != stint[..., :-1]
+    starts = np.flatnonzero(new_segment)
+    lengths = np.diff(np.append(starts, stint.size))
+    ends = starts + lengths - 1
+
+    wear = stacked["tire_wear"].ravel()
+    return {
+        "wear": wear,
+        "delta": delta.ravel(),
+        "position": (np.arange(stint.size) - np.repeat(starts, lengths)).astype(np.int32),
+        "starts": starts,
+        "lengths": lengths,
+        "valid": stint.ravel()[starts] >= 0,
+        "stopped": stacked["pit"].ravel()[ends],
+        "wear_at_stop": wear[ends],
+    }
+
+
+def backtest_thresholds(races, pit_wear=DEFAULT_PIT_WEAR, lap_delta=DEFAULT_LAP_DELTA,
+                        monitor_wear=DEFAULT_MONITOR_WEAR, wear_time_cost=0.1, pit_loss=20.0,
+                        max_cells=1 << 23):
+    """
+    Score threshold rules over every lap of every car of every race.
+
+    The rule calls PIT NOW when ``tire_wear > pit_wear`` or the lap time rose
+    by more than ``lap_delta`` (as a fraction) over the previous lap, and
+    raises a warning (Monitor Tires) when ``tire_wear > monitor_wear``.
+    Threshold arguments broadcast against each other, so passing
+    ``np.meshgrid`` arrays sweeps a whole grid.
+
+    Args:
+        races: List of race dicts (see ``load_races``) or ``stack_races`` output
+        pit_wear: PIT NOW tire wear threshold(s) (%)
+        lap_delta: PIT NOW relative lap-time jump threshold(s)
+        monitor_wear: Warning tire wear threshold(s) (%)
+        wear_time_cost: Lap time lost per % of tire wear (s)
+        pit_loss: Time lost in a pit stop (s)
+        max_cells: Rule-by-lap elements evaluated per chunk (bounds memory)
+
+    Returns:
+        Dict of arrays with the broadcast threshold shape:
+        ``mean_error`` and ``mean_abs_error`` (laps), ``late_share`` (share of
+        stops the rule only reached after the stop), ``unneeded_stops`` and
+        ``time_lost`` (s) per race, and ``warning_laps`` (mean laps of warning
+        before the call)
+    """
+    stacked = races if isinstance(races, dict) else stack_races(races)
+    n_races = stacked["stint"].shape[0]
+    laps = _stints(stacked)
+    pit_wear, lap_delta, monitor_wear = np.broadcast_arrays(
+        np.asarray(pit_wear, dtype=float), np.asarray(lap_delta, dtype=float), np.asarray(monitor_wear, dtype=float))
+    grid_shape = pit_wear.shape
+    rules = np.column_stack([pit_wear.ravel(), lap_delta.ravel(), monitor_wear.ravel()])
+
+    starts, lengths = laps["starts"], laps["lengths"]
+    stopped = laps["valid"] & laps["stopped"]
+    final = laps["valid"] & ~laps["stopped"]
+    stop_position = lengths - 1
+    wear_at_stop = laps["wear_at_stop"]
+    wear_rate = wear_at_stop / lengths
+    never = np.iinfo(np.int32).max
+
+    metrics = {name: np.empty(len(rules)) for name in
+               ("mean_error", "mean_abs_error", "late_share", "unneeded_stops", "time_lost", "warning_laps")}
+    chunk = max(1, max_cells // max(len(laps["wear"]), 1))
+    for first in range(0, len(rules), chunk):
+        pw, ld, mw = (column[:, None] for column in rules[first:first + chunk].T)
+
+        # First PIT NOW and first warning lap of each stint, per rule
+        calls = (laps["wear"] > pw) | (laps["delta"] > ld)
+        first_call = np.minimum.reduceat(np.where(calls, laps["position"], never), starts, axis=1)
+        warnings = laps["wear"] > mw
+        first_warning = np.minimum.reduceat(np.where(warnings, laps["position"], never), starts, axis=1)
+
+        # A stint with no call by the stop: extrapolate when the wear rule would fire
+        late = first_call == never
+        laps_over = np.floor(np.maximum(pw - wear_at_stop, 0.0) / np.maximum(wear_rate, 1e-9)) + 1
+        error = np.where(late, laps_over, first_call - stop_position)
+
+        lost = np.where(error < 0, pit_loss * -error / lengths, wear_time_cost * wear_at_stop * error)
+        extra_stop = ~late & final
+        lost = np.where(stopped, lost, 0.0) + pit_loss * extra_stop
+        call_position = np.where(late, stop_position + laps_over, first_call)
+        warned = stopped & (first_warning < call_position)
+
+        n_stops = max(stopped.sum(), 1)
+        rows = slice(first, first + chunk)
+        metrics["mean_error"][rows] = np.where(stopped, error, 0.0).sum(axis=1) / n_stops
+        metrics["mean_abs_error"][rows] = np.where(stopped, np.abs(error), 0.0).sum(axis=1) / n_stops
+        metrics["late_share"][rows] = (late & stopped).sum(axis=1) / n_stops
+        metrics["unneeded_stops"][rows] = extra_stop.sum(axis=1) / n_races
+        metrics["time_lost"][rows] = lost.sum(axis=1) / n_races
+        metrics["warning_laps"][rows] = (np.where(warned, call_position - first_warning, 0.0).sum(axis=1)
+                                         / np.maximum(warned.sum(axis=1), 1))
+
+    return {name: values.reshape(grid_shape) for name, values in metrics.items()}
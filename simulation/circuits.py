@@ -0,0 +1,245 @@
+"""
+Custom circuit loading with a compiled, memory-mapped geometry cache.
+
+A circuit is a JSON definition in ``tracks/`` that points at a centerline
+file (CSV with x,y columns, or a ``.geojson`` LineString/Polygon in lon/lat) and
+carries the timing metadata:
+
+    {
+        "centerline": "my_track.csv",
+        "track_width": 12,
+        "points": 800,
+        "smoothing": 2.0,
+        "sectors": [0.0, 0.31, 0.64],
+        "drs_zones": [[[x0, x1, ...], [y0, y1, ...]]],
+        "speed_trap": [[x0, x1, ...], [y0, y1, ...]]
+    }
+
+``sectors`` are the lap fractions at which each sector starts. DRS zones and
+the speed trap are closed polygons in the centerline's coordinates.
+
+The first load compiles the definition into a TrackGeometry and writes its
+arrays as ``.npy`` files under a directory named by a hash of every input.
+Later loads memory-map those files, so no parsing, resampling or smoothing
+happens again until the definition or its centerline changes.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from .racing_line import DEFAULT_TRACK_WIDTH, compute_racing_line, smooth_closed
+from .track_geometry import TrackGeometry
+
+TRACKS_DIR = Path(__file__).resolve().parent.parent / "tracks"
+CACHE_DIR = Path(__file__).resolve().parent.parent / ".track_cache"
+
+# Bump when the compiled layout or the compile steps change
+COMPILER_VERSION = 1
+
+EARTH_RADIUS_M = 6371000.0
+
+
+def available_circuits(tracks_dir=TRACKS_DIR):
+    """Names of the circuit definitions found in ``tracks_dir``."""
+    tracks_dir = Path(tracks_dir)
+    if not tracks_dir.is_dir():
+        return []
+    return sorted(path.stem for path in tracks_dir.glob("*.json"))
+
+
+def _read_csv_centerline(path):
+    """Read x,y columns from a CSV file, skipping a header row if present."""
+    with open(path, "r", encoding="utf-8") as f:
+        first = f.readline()
+    try:
+        [float(v) for v in first.strip().split(",")[:2]]
+        skip = 0
+    except ValueError:
+        skip = 1
+    data = np.loadtxt(path, delimiter=",", skiprows=skip, usecols=(0, 1), ndmin=2)
+    return data[:, 0], data[:, 1]
+
+
+def _lonlat_projection(coords):
+    """Return a function projecting lon/lat pairs onto local metres around the centroid."""
+    lon0, lat0 = np.radians(coords.mean(axis=0))
+
+    def project(points):
+        points = np.radians(np.asarray(points, dtype=float))
+        x = EARTH_RADIUS_M * (points[..., 0] - lon0) * np.cos(lat0)
+        y = EARTH_RADIUS_M * (points[..., 1] - lat0)
+        return x, y
+
+    return project
+
+
+def _read_geojson_centerline(path):
+    """Read the first LineString/Polygon ring from a GeoJSON file, in lon/lat."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    if data.get("type") == "FeatureCollection":
+        geometries = [feature["geometry"] for feature in data.get("features", [])]
+    elif data.get("type") == "Feature":
+        geometries = [data["geometry"]]
+    else:
+        geometries = [data]
+
+    for geometry in geometries:
+        if geometry["type"] == "LineString":
+            return np.asarray(geometry["coordinates"], dtype=float)[:, :2]
+        if geometry["type"] == "Polygon":
+            return np.asarray(geometry["coordinates"][0], dtype=float)[:, :2]
+    raise ValueError(f"No LineString or Polygon geometry in {path}")
+
+
+def _resample_closed(x, y, n_points):
+    """Resample a closed polyline to ``n_points`` evenly spaced by arc length."""
+    if x[0] != x[-1] or y[0] != y[-1]:
+        x = np.append(x, x[0])
+        y = np.append(y, y[0])
+    distance = np.concatenate(([0.0], np.cumsum(np.hypot(np.diff(x), np.diff(y)))))
+    samples = np.linspace(0.0, distance[-1], n_points)
+    return np.interp(samples, distance, x), np.interp(samples, distance, y)
+
+
+def _definition_hash(definition_path, centerline_path, n_points, track_width):
+    digest = hashlib.sha256()
+    digest.update(f"v{COMPILER_VERSION}:{n_points}:{track_width}".encode())
+    digest.update(Path(definition_path).read_bytes())
+    digest.update(Path(centerline_path).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def _stack_zones(zones):
+    """
+    Stack polygons with different vertex counts into (n_zones, 2, n_vertices).
+
+    Shorter polygons repeat their last (closing) vertex up to the longest
+    one, which leaves the drawn shape unchanged.
+    """
+    zones = [np.asarray(zone, dtype=float).reshape(2, -1) for zone in zones]
+    if not zones:
+        return np.zeros((0, 2, 0))
+    n_vertices = max(zone.shape[1] for zone in zones)
+    return np.stack([np.pad(zone, ((0, 0), (0, n_vertices - zone.shape[1])), mode="edge") for zone in zones])
+
+
+def compile_circuit(name, definition, centerline_path, n_points=None, track_width=None):
+    """
+    Build a TrackGeometry from a parsed circuit definition.
+
+    Args:
+        name: Circuit name
+        definition: Parsed JSON definition (see module docstring)
+        centerline_path: Path of the CSV or GeoJSON centerline
+        n_points: Resampled centerline resolution, or None for the definition's
+        track_width: Usable track width, or None for the definition's
+
+    Returns:
+        TrackGeometry instance
+    """
+    n_points = int(n_points or definition.get("points", 600))
+    track_width = float(track_width or definition.get("track_width", DEFAULT_TRACK_WIDTH))
+
+    drs_zones = definition.get("drs_zones", [])
+    speed_trap = definition.get("speed_trap", [[], []])
+    if Path(centerline_path).suffix.lower() == ".geojson":
+        coords = _read_geojson_centerline(centerline_path)
+        project = _lonlat_projection(coords)
+        x, y = project(coords)
+        drs_zones = [project(np.stack(zone, axis=-1)) for zone in drs_zones]
+        speed_trap = project(np.stack(speed_trap, axis=-1)) if len(speed_trap[0]) else speed_trap
+    else:
+        x, y = _read_csv_centerline(centerline_path)
+
+    x, y = _resample_closed(x, y, n_points)
+    sigma = float(definition.get("smoothing", 0.0))
+    if sigma > 0:
+        x = smooth_closed(x[:-1], sigma)
+        y = smooth_closed(y[:-1], sigma)
+        x, y = np.append(x, x[0]), np.append(y, y[0])
+    racing_x, racing_y = compute_racing_line(x, y, track_width=track_width)
+
+    sector_starts = np.asarray(definition.get("sectors", [0.0]), dtype=float)
+    sector_boundaries = np.append(np.round(sector_starts * (n_points - 1)), n_points).astype(np.intp)
+
+    drs_zones = _stack_zones(drs_zones)
+    return TrackGeometry(
+        name,
+        x,
+        y,
+        racing_x,
+        racing_y,
+        sector_boundaries,
+        drs_zones,
+        np.asarray(speed_trap, dtype=float),
+        track_width=track_width,
+        view_range=definition.get("view_range"),
+    )
+
+
+def _write_cache(cache_path, geometry):
+    """Write a compiled geometry atomically: build in a temp dir, then rename."""
+    tmp_dir = None
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(dir=cache_path.parent, prefix=".tmp-"))
+        meta, arrays = geometry.to_arrays()
+        for field, value in arrays.items():
+            np.save(tmp_dir / f"{field}.npy", np.ascontiguousarray(value))
+        (tmp_dir / "meta.json").write_text(json.dumps(meta), encoding="utf-8")
+        os.replace(tmp_dir, cache_path)
+    except OSError:
+        # Another process won the race, or the cache dir is read-only
+        if tmp_dir is not None:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _load_array(path):
+    try:
+        return np.load(path, mmap_mode="r")
+    except ValueError:
+        # Empty arrays (e.g. a circuit without DRS zones) cannot be mapped
+        return np.load(path)
+
+
+def _read_cache(cache_path):
+    meta = json.loads((cache_path / "meta.json").read_text(encoding="utf-8"))
+    arrays = {field: _load_array(cache_path / f"{field}.npy") for field in TrackGeometry.ARRAY_FIELDS}
+    return TrackGeometry.from_arrays(meta, arrays)
+
+
+def load_circuit(name, n_points=None, track_width=None, tracks_dir=TRACKS_DIR, cache_dir=CACHE_DIR):
+    """
+    Load a circuit definition, compiling it on first use.
+
+    Args:
+        name: Definition file stem in ``tracks_dir``
+        n_points: Override for the definition's resolution
+        track_width: Override for the definition's track width
+        tracks_dir: Directory holding the definitions and centerlines
+        cache_dir: Directory for compiled geometry
+
+    Returns:
+        TrackGeometry instance backed by memory-mapped arrays
+    """
+    definition_path = Path(tracks_dir) / f"{name}.json"
+    with open(definition_path, "r", encoding="utf-8") as f:
+        definition = json.load(f)
+    centerline_path = Path(tracks_dir) / definition["centerline"]
+
+    key = _definition_hash(definition_path, centerline_path, n_points, track_width)
+    cache_path = Path(cache_dir) / f"{name}-{key}"
+    if not (cache_path / "meta.json").exists():
+        geometry = compile_circuit(name, definition, centerline_path, n_points, track_width)
+        _write_cache(cache_path, geometry)
+        if not (cache_path / "meta.json").exists():
+            return geometry
+    return _read_cache(cache_path)
@@ -0,0 +1,113 @@
+"""
+Online lap-time model: tire degradation and fuel correction per car.
+
+Lap time is modelled as ``base + wear_cost * tire_wear + fuel_cost * fuel``
+and fitted by recursive least squares. Each lap is a rank-one update of a
+3x3 covariance per car, so the cost per lap is constant however long the
+race, and all cars are updated in one batched NumPy step.
+
+Within a first stint wear rises while fuel falls at a near-constant ratio,
+so the two costs cannot be told apart from the data alone; the fit starts
+from a prior (``DEFAULT_PRIOR``) and keeps it along that direction until a
+stop breaks the tie.
+"""
+
+import numpy as np
+
+# Prior coefficients: base pace (s), s per % of wear, s per % of fuel
+DEFAULT_PRIOR = (90.0, 0.1, 0.03)
+# Prior standard deviation of each coefficient
+DEFAULT_PRIOR_SD = (5.0, 0.05, 0.02)
+
+
+class DegradationModel:
+    """Recursive least-squares lap-time model for ``n_cars`` cars.
+
+    Attributes:
+        coef: Fitted (base, wear_cost, fuel_cost) per car, shape (cars, 3)
+        wear_rate: Smoothed tire wear per lap of the current set (%), shape (cars,)
+        laps: Laps each car has been updated with, shape (cars,)
+    """
+
+    def __init__(self, n_cars=1, prior=DEFAULT_PRIOR, prior_sd=DEFAULT_PRIOR_SD, forgetting=1.0,
+                 noise_sd=2.0, wear_rate=4.0, wear_smoothing=0.3):
+        """
+        Args:
+            n_cars: Number of cars
+            prior: Starting (base, wear_cost, fuel_cost)
+            prior_sd: Prior standard deviation of each coefficient
+            forgetting: RLS forgetting factor; below 1.0 older laps weigh less
+            noise_sd: Expected lap-to-lap noise (s), scaling the prior's weight
+            wear_rate: Starting estimate of tire wear per lap (%)
+            wear_smoothing: Weight of the latest lap in the wear-rate average
+        """
+        self.n_cars = n_cars
+        self.forgetting = forgetting
+        self.wear_smoothing = wear_smoothing
+        self.coef = np.tile(np.asarray(prior, dtype=float), (n_cars, 1))
+        self.cov = np.tile(np.diag((np.asarray(prior_sd, dtype=float) / noise_sd) ** 2), (n_cars, 1, 1))
+        self.wear_rate = np.full(n_cars, float(wear_rate))
+        self.laps = np.zeros(n_cars, dtype=np.int64)
+        self._last_wear = np.full(n_cars, np.nan)
+
+    @property
+    def base_pace(self):
+        """Lap time on new tires with an empty tank (s), shape (cars,)."""
+        return self.coef[:, 0]
+
+    @property
+    def wear_cost(self):
+        """Lap time lost per % of tire wear (s), shape (cars,)."""
+        return self.coef[:, 1]
+
+    @property
+    def fuel_cost(self):
+        """Lap time lost per % of fuel load (s), shape (cars,)."""
+        return self.coef[:, 2]
+
+    @property
+    def degradation_slope(self):
+        """Lap time lost per lap of tire age on the current set (s/lap), shape (cars,)."""
+        return self.wear_cost * self.wear_rate
+
+    def update(self, lap_time, tire_wear, fuel, valid=None):
+        """
+        Fold one lap per car into the model.
+
+        Args:
+            lap_time: Lap time of each car (s), shape (cars,)
+            tire_wear: Tire wear at the end of the lap (%), shape (cars,)
+            fuel: Fuel load at the end of the lap (%), shape (cars,)
+            valid: Cars whose lap should be fitted (e.g. not pit laps); by
+                default every car. Wear tracking still sees every lap.
+        """
+        lap_time = np.broadcast_to(np.asarray(lap_time, dtype=float), (self.n_cars,))
+        tire_wear = np.broadcast_to(np.asarray(tire_wear, dtype=float), (self.n_cars,))
+        fuel = np.broadcast_to(np.asarray(fuel, dtype=float), (self.n_cars,))
+        valid = np.ones(self.n_cars, dtype=bool) if valid is None else np.asarray(valid, dtype=bool)
+
+        # Wear rate: smoothed rise per lap; a drop means a new set, which keeps the estimate
+        step = tire_wear - self._last_wear
+        rising = step > 0
+        self.wear_rate[rising] += self.wear_smoothing * (step[rising] - self.wear_rate[rising])
+        self._last_wear = tire_wear.copy()
+
+        cars = np.flatnonzero(valid & np.isfinite(lap_time))
+        if not len(cars):
+            return
+        x = np.column_stack([np.ones(len(cars)), tire_wear[cars], fuel[cars]])   # (n, 3)
+        cov = self.cov[cars]
+        px = np.einsum("nij,nj->ni", cov, x)
+        gain = px / (self.forgetting + np.einsum("ni,ni->n", x, px))[:, None]
+        error = lap_time[cars] - np.einsum("ni,ni->n", x, self.coef[cars])
+        self.coef[cars] += gain * error[:, None]
+        self.cov[cars] = (cov - gain[:, :, None] * px[:, None, :]) / self.forgetting
+        self.laps[cars] += 1
+
+    def predict(self, tire_wear, fuel):
+        """Expected lap time of each car at the given wear and fuel load."""
+        return self.base_pace + self.wear_cost * np.asarray(tire_wear) + self.fuel_cost * np.asarray(fuel)
+
+    def fuel_corrected(self, lap_time, fuel):
+        """Lap time with the fitted cost of the fuel load removed."""
+        return np.asarray(lap_time) - self.fuel_cost * np.asarray(fuel)
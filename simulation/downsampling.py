@@ -0,0 +1,120 @@
+"""
+Downsampling for charts that are a few hundred pixels wide.
+
+A line chart cannot show more than a couple of points per horizontal pixel,
+so long series are reduced before they are sent to the browser:
+
+- min/max bucketing keeps the lowest and highest sample of each bucket, so
+  every visible peak and trough survives. With fixed-size buckets the output
+  for completed buckets never changes as samples are appended, which lets an
+  incremental chart resend only its last bucket.
+- Largest-Triangle-Three-Buckets (LTTB) keeps one sample per bucket, the one
+  forming the largest triangle with its neighbours, which preserves the shape
+  of the line with fewer points.
+"""
+
+import numpy as np
+
+
+def bucket_size_for(n, n_buckets):
+    """Smallest power-of-two bucket size that splits ``n`` samples into at most ``n_buckets``."""
+    if n <= n_buckets:
+        return 1
+    return 1 << int(np.ceil(np.log2(n / n_buckets)))
+
+
+def minmax_indices(y, bucket_size):
+    """
+    Indices of the min and max of each fixed-size bucket, in sample order.
+
+    Args:
+        y: Sample values
+        bucket_size: Samples per bucket; the last bucket may be partial
+
+    Returns:
+        Tuple (indices, n_complete): sorted sample indices, and how many of
+        them come from complete buckets (those never change when samples are
+        appended)
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n == 0:
+        return np.zeros(0, dtype=np.intp), 0
+    if bucket_size <= 1:
+        return np.arange(n), n
+
+    n_buckets = -(-n // bucket_size)
+    padded = np.full(n_buckets * bucket_size, np.nan)
+    padded[:n] = y
+    # NaN samples (and the padding) never win; an all-NaN bucket keeps its first sample
+    buckets = padded.reshape(n_buckets, bucket_size)
+    missing = np.isnan(buckets)
+    base = np.arange(n_buckets) * bucket_size
+    lowest = base + np.argmin(np.where(missing, np.inf, buckets), axis=1)
+    highest = base + np.argmax(np.where(missing, -np.inf, buckets), axis=1)
+
+    first = np.minimum(lowest, highest)
+    second = np.maximum(lowest, highest)
+    pairs = np.column_stack([first, second])
+    keep = np.ones(pairs.shape, dtype=bool)
+    keep[:, 1] = second != first
+    indices = pairs[keep]
+    indices = indices[indices < n]
+
+    complete = n // bucket_size
+    n_complete = int(keep[:complete].sum())
+    return indices, n_complete
+
+
+def minmax(x, y, n_buckets):
+    """Reduce (x, y) to the min and max of at most ``n_buckets`` equal-size buckets."""
+    indices, _ = minmax_indices(y, bucket_size_for(len(y), n_buckets))
+    return np.asarray(x)[indices], np.asarray(y)[indices]
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Indices kept by Largest-Triangle-Three-Buckets.
+
+    The first and last samples are always kept; the rest are split into
+    ``n_out - 2`` buckets and one sample is chosen per bucket. Bucket
+    averages are computed in one pass; only the choice of each point, which
+    depends on the point chosen before it, is sequential.
+
+    Args:
+        x: Sample positions (increasing)
+        y: Sample values
+        n_out: Number of samples to keep
+
+    Returns:
+        Sorted sample indices
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    starts, stops = edges[:-1], edges[1:]
+    counts = stops - starts
+    avg_x = np.add.reduceat(x[:n - 1], starts) / counts
+    avg_y = np.add.reduceat(y[:n - 1], starts) / counts
+    # The bucket after the last one is the final sample
+    next_x = np.append(avg_x[1:], x[-1])
+    next_y = np.append(avg_y[1:], y[-1])
+
+    indices = np.empty(n_out, dtype=np.intp)
+    indices[0], indices[-1] = 0, n - 1
+    prev = 0
+    for i, (a, b) in enumerate(zip(starts, stops)):
+        area = np.abs((x[prev] - next_x[i]) * (y[a:b] - y[prev]) - (x[prev] - x[a:b]) * (next_y[i] - y[prev]))
+        prev = a + int(np.argmax(area))
+        indices[i + 1] = prev
+    return indices
+
+
+def lttb(x, y, n_out):
+    """Reduce (x, y) to ``n_out`` samples with Largest-Triangle-Three-Buckets."""
+    indices = lttb_indices(x, y, n_out)
+    return np.asarray(x)[indices], np.asarray(y)[indices]
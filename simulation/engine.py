@@ -0,0 +1,243 @@
+"""
+Headless race engine: the dashboard's race model without Streamlit.
+
+``RaceEngine`` owns everything that changes as a race runs: the telemetry
+source, the live TelemetryStore, the lap-time model, sector timing and
+weather samples. ``step()`` completes one lap for the whole field and
+``run_until()`` fast-forwards, with no clock and no UI, so a race runs as
+fast as the per-lap updates allow. The Monte Carlo pit call is the one
+expensive piece, so it is computed on demand for the laps someone asks
+about (and cached), never inside ``step()``.
+
+Laps come from the synthetic generator or, with ``RaceEngine.replay``, from
+a recorded race on disk (see ``simulation.replay``), read one lap at a time.
+Sector timing is fed from sub-lap (distance, time) samples: the generator's
+``samples_per_lap`` channels, or a recording's high-frequency channels. A
+lap-only recording has no sector timing.
+
+The dashboard keeps one engine per session and advances it to the tick its
+RaceClock has reached, and reads its race panels from the engine. Its live
+weather panel refreshes on the wall clock instead; the engine's lap-based
+weather sampler is for headless runs.
+"""
+
+import numpy as np
+
+from .degradation import DegradationModel
+from .sector_timing import SectorTimer
+from .strategy import FUEL_TIME_COST, WEAR_TIME_COST, recommend
+from .telemetry import DEFAULT_CHUNK_LAPS, iter_telemetry
+from .telemetry_store import TelemetryStore
+
+# Channels kept in the live store, one row of shape (cars,) per lap
+ENGINE_CHANNELS = {
+    "lap": np.int64,
+    "lap_time": np.float64,
+    "race_time": np.float64,
+    "tire_wear": np.float64,
+    "fuel": np.float64,
+    "pit": np.bool_,
+    "stint": np.int64,
+}
+
+# Sub-lap samples generated per lap for sector timing
+SECTOR_SAMPLES = 50
+
+
+class RaceEngine:
+    """One race for ``n_cars`` cars, advanced a lap at a time."""
+
+    def __init__(self, n_laps, n_cars=1, seed=None, geometry=None, weather=None, weather_every=1,
+                 n_scenarios=1000, base_lap_time=90.0, history=None, chunk_laps=DEFAULT_CHUNK_LAPS,
+                 recording=None, **model):
+        """
+        Args:
+            n_laps: Race length in laps
+            n_cars: Field size
+            seed: Telemetry seed; the same seed gives the same race as
+                ``generate_telemetry`` (for races up to ``chunk_laps`` long)
+            geometry: TrackGeometry for sector timing, or None to skip it
+                (also skipped when replaying a recording without samples)
+            weather: Callable ``weather(lap, race_time)`` returning a sample,
+                or None
+            weather_every: Laps between weather samples
+            n_scenarios: Monte Carlo scenarios per pit option
+            base_lap_time: Prior base pace for the lap-time model (s)
+            history: Keep only the latest laps in the store (ring buffer), or
+                None to keep the whole race
+            chunk_laps: Laps of telemetry generated per block
+            recording: Recording to play back instead of generating
+                telemetry (see ``replay``)
+            **model: Telemetry model overrides passed to ``iter_telemetry``
+        """
+        self.n_laps = n_laps
+        self.n_cars = n_cars
+        self.n_scenarios = n_scenarios
+        self.weather_sampler = weather
+        self.weather_every = max(int(weather_every), 1)
+        self.weather = None
+        self.lap = 0
+
+        self.sectors = None
+        if geometry is not None and (recording is None or recording.sample_channels):
+            self._track_length = geometry.length
+            self._sector_fractions = np.asarray(geometry.sector_distances[1:-1]) / geometry.length
+            self.sectors = SectorTimer.for_track(geometry, n_cars)
+            self.sectors.update(np.zeros(n_cars), np.zeros(n_cars))
+            if recording is None:
+                model.setdefault("samples_per_lap", SECTOR_SAMPLES)
+
+        self.recording = recording
+        self._chunks = None
+        if recording is None:
+            self._chunks = iter_telemetry(n_cars, n_laps, seed, chunk_laps=chunk_laps, **model)
+        self._chunk = None
+        self._chunk_offset = 0
+
+        capacity = history or max(n_laps, 1)
+        self.store = TelemetryStore(ENGINE_CHANNELS, capacity=capacity, ring=history is not None,
+                                    row_shape=(n_cars,))
+        self.model = DegradationModel(n_cars, prior=(base_lap_time, WEAR_TIME_COST, FUEL_TIME_COST))
+        self._decisions = {}
+
+        if self.weather_sampler is not None:
+            self.weather = self.weather_sampler(0, 0.0)
+
+    @classmethod
+    def replay(cls, recording, **kwargs):
+        """Engine that plays back ``recording`` lap by lap; see ``__init__`` for the options."""
+        return cls(recording.n_laps, recording.n_cars, recording=recording, **kwargs)
+
+    @property
+    def finished(self):
+        return self.lap >= self.n_laps
+
+    def _next_lap(self):
+        """
+        Telemetry of the next lap, pulling a new block when needed.
+
+        Returns:
+            Tuple (row, sector_times): one value per car for each channel, and
+            the time into the lap at which each car reached each sector after
+            the first, shape (cars, sectors - 1), or None without sector timing
+        """
+        if self.recording is not None:
+            row = self.recording.lap(self.lap)
+            row["lap"] = np.full(self.n_cars, self.lap + 1)
+            sector_times = None
+            if self.sectors is not None:
+                crossings = self._sector_fractions * self.recording.lap_length
+                sector_times = np.array([
+                    np.interp(crossings, samples["distance"], samples["time"])
+                    for samples in (self.recording.samples(car, self.lap) for car in range(self.n_cars))
+                ])
+            return row, sector_times
+        if self._chunk is None or self._chunk_offset >= len(self._chunk["lap"]):
+            self._chunk = next(self._chunks)
+            self._chunk_offset = 0
+        i = self._chunk_offset
+        self._chunk_offset += 1
+        row = {name: self._chunk[name][:, i] for name in ENGINE_CHANNELS if name != "lap"}
+        row["lap"] = np.full(self.n_cars, self._chunk["lap"][i])
+        sector_times = None
+        if self.sectors is not None:
+            sector_times = _time_into_lap(self._chunk["sample_time"][:, i], self._sector_fractions)
+        return row, sector_times
+
+    def step(self):
+        """
+        Complete one lap for every car.
+
+        Returns:
+            False once the race is over (nothing was done), True otherwise
+        """
+        if self.finished:
+            return False
+        row, sector_times = self._next_lap()
+        self.store.append(**row)
+        # Pit laps carry the stop's time loss, so they only feed the wear tracking
+        self.model.update(row["lap_time"], row["tire_wear"], row["fuel"], valid=~row["pit"])
+        if self.sectors is not None:
+            # One sample per sector boundary crossed this lap, then the line
+            lap_start = row["race_time"] - row["lap_time"]
+            lap_distance = (row["lap"] - 1) * self._track_length
+            for fraction, elapsed in zip(self._sector_fractions, sector_times.T):
+                self.sectors.update(lap_distance + fraction * self._track_length, lap_start + elapsed)
+            self.sectors.update(row["lap"] * self._track_length, row["race_time"])
+        self.lap += 1
+        if self.weather_sampler is not None and self.lap % self.weather_every == 0:
+            self.weather = self.weather_sampler(self.lap, float(row["race_time"].max()))
+        return True
+
+    def run_until(self, lap):
+        """
+        Step until ``lap`` laps are complete (or the race ends).
+
+        Returns:
+            Number of laps stepped
+        """
+        start = self.lap
+        while self.lap < min(lap, self.n_laps) and self.step():
+            pass
+        return self.lap - start
+
+    def column(self, channel, car=0):
+        """Every stored lap of one car's channel (a view)."""
+        return self.store.column(channel)[:, car]
+
+    def latest(self, channel, car=0):
+        return self.store.latest(channel)[car]
+
+    def decision(self, car=0):
+        """
+        Pit call for ``car`` at the current lap, computed once per lap.
+
+        Returns:
+            Tuple (decision, option label, confidence)
+        """
+        key = (self.lap, car)
+        if key not in self._decisions:
+            model = self.model
+            self._decisions = {k: v for k, v in self._decisions.items() if k[0] == self.lap}
+            self._decisions[key] = recommend(
+                self.n_laps - self.lap, self.latest("tire_wear", car), self.latest("fuel", car),
+                model.base_pace[car], model.wear_rate[car], wear_time_cost=model.wear_cost[car],
+                fuel_time_cost=model.fuel_cost[car], n_scenarios=self.n_scenarios, seed=self.lap,
+            )
+        return self._decisions[key]
+
+    def state(self, car=0):
+        """Latest telemetry, lap-time model outputs and pit call for one car."""
+        lap_time = self.latest("lap_time", car)
+        fuel = self.latest("fuel", car)
+        decision, option, confidence = self.decision(car)
+        return {
+            "lap": self.latest("lap", car),
+            "lap_time": lap_time,
+            "tire_wear": self.latest("tire_wear", car),
+            "fuel": fuel,
+            "degradation": self.model.degradation_slope[car],
+            "corrected_pace": self.model.fuel_corrected(lap_time, fuel)[car],
+            "decision": decision,
+            "option": option,
+            "confidence": confidence,
+        }
+
+
+def _time_into_lap(sample_time, fractions):
+    """
+    Interpolate ``iter_telemetry`` sample times at fractions of the lap.
+
+    Args:
+        sample_time: Time into the lap at the end of each of the lap's equal
+            distance steps, shape (cars, samples)
+        fractions: Fractions of the lap, each in [0, 1]
+
+    Returns:
+        Array of shape (cars, len(fractions))
+    """
+    n_samples = sample_time.shape[1]
+    times = np.column_stack((np.zeros(len(sample_time)), sample_time))
+    position = np.asarray(fractions) * n_samples
+    step = np.minimum(position.astype(np.int64), n_samples - 1)
+    return times[:, step] + (position - step) * (times[:, step + 1] - times[:, step])
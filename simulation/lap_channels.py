@@ -0,0 +1,219 @@
+"""
+High-frequency car channels (speed, throttle, brake, gear, RPM) indexed by lap.
+
+Samples for every car and lap live in one set of columnar arrays, with a
+(car, lap) -> (start, stop) index and the arc-length distance of each sample
+into its lap. Any lap is a pair of slices, and comparing laps is a single
+``np.interp`` over all of them at once: each lap's distances are offset by
+its position in the request, so one monotonic key covers every lap.
+
+``synthesize_lap_channels`` produces matching synthetic data from a track's
+curvature and a table of lap times, with no per-lap or per-sample loop.
+"""
+
+import numpy as np
+
+from .racing_line import smooth_closed
+from .telemetry_store import TelemetryStore
+
+# Compact per-sample storage: about 17 bytes per sample with distance and time
+CHANNEL_DTYPES = {
+    "distance": np.float32,  # metres from the start line
+    "time": np.float32,      # seconds since the lap started
+    "speed": np.float32,     # km/h
+    "throttle": np.uint8,    # percent
+    "brake": np.uint8,       # percent
+    "gear": np.int8,
+    "rpm": np.uint16,
+}
+
+# Synthetic car model
+MAX_SPEED = 90.0        # m/s
+LATERAL_GRIP = 40.0     # m/s^2 available in corners
+SPEED_PER_GEAR = 45.0   # km/h covered by each of the 8 gears
+IDLE_RPM = 4000
+MAX_RPM = 12000
+
+
+class LapChannels:
+    """Columnar high-frequency samples for ``n_cars`` cars over ``n_laps`` laps.
+
+    Samples are appended in blocks (any mix of cars and laps) and stored in a
+    growing TelemetryStore, so memory is the samples themselves plus a
+    two-integer index entry per lap.
+    """
+
+    def __init__(self, n_cars, n_laps, hz, lap_length, capacity=1 << 16):
+        """
+        Args:
+            n_cars: Number of cars
+            n_laps: Number of laps
+            hz: Sample rate, for reference by consumers
+            lap_length: Lap length in metres
+            capacity: Samples preallocated before the first growth
+        """
+        self.n_cars = n_cars
+        self.n_laps = n_laps
+        self.hz = hz
+        self.lap_length = float(lap_length)
+        self.samples = TelemetryStore(CHANNEL_DTYPES, capacity=capacity)
+        # Sample range of each (car, lap); laps without data have start == stop == 0
+        self.start = np.zeros((n_cars, n_laps), dtype=np.int64)
+        self.stop = np.zeros((n_cars, n_laps), dtype=np.int64)
+
+    @property
+    def nbytes(self):
+        return sum(self.samples.column(name).nbytes for name in CHANNEL_DTYPES)
+
+    def extend(self, car, lap, **channels):
+        """
+        Append a block of samples.
+
+        Args:
+            car: Car index of each sample
+            lap: Lap index (0-based) of each sample; samples of one lap must be
+                contiguous and in distance order
+            **channels: One array per name in CHANNEL_DTYPES
+        """
+        car = np.asarray(car, dtype=np.int64)
+        lap = np.asarray(lap, dtype=np.int64)
+        if not len(car):
+            return
+        offset = self.samples.count
+        self.samples.extend(**channels)
+
+        # One index entry per run of equal (car, lap)
+        changes = np.flatnonzero((np.diff(car) != 0) | (np.diff(lap) != 0)) + 1
+        starts = np.concatenate(([0], changes))
+        stops = np.append(changes, len(car))
+        self.start[car[starts], lap[starts]] = offset + starts
+        self.stop[car[starts], lap[starts]] = offset + stops
+
+    def has_lap(self, car, lap):
+        return self.stop[car, lap] > self.start[car, lap]
+
+    def lap(self, car, lap):
+        """Dict of views of every channel for one lap."""
+        sl = slice(self.start[car, lap], self.stop[car, lap])
+        return {name: self.samples.column(name)[sl] for name in CHANNEL_DTYPES}
+
+    def align(self, car, laps, channel, grid):
+        """
+        Resample a channel of several laps onto a common distance grid.
+
+        Args:
+            car: Car index
+            laps: Lap indices to align (laps without data give NaN rows)
+            channel: Channel name
+            grid: Distances (metres) to sample at
+
+        Returns:
+            Array of shape (len(laps), len(grid))
+        """
+        laps = np.atleast_1d(np.asarray(laps, dtype=np.int64))
+        grid = np.asarray(grid, dtype=float)
+        starts = self.start[car, laps]
+        counts = self.stop[car, laps] - starts
+        out = np.full((len(laps), len(grid)), np.nan)
+        present = counts > 0
+        if not present.any():
+            return out
+
+        # Gather every requested lap's samples into one flat run
+        starts, counts = starts[present], counts[present]
+        row = np.repeat(np.arange(len(counts)), counts)
+        index = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + starts[row]
+        distance = self.samples.column("distance")[index].astype(float)
+        values = self.samples.column(channel)[index].astype(float)
+
+        # Offset lap k by k * span so one interp covers all laps; clamp the
+        # grid to each lap's sampled range so laps never blend into each other
+        span = 2.0 * self.lap_length + 1.0
+        first = distance[np.cumsum(counts) - counts]
+        last = distance[np.cumsum(counts) - 1]
+        targets = np.clip(grid[None, :], first[:, None], last[:, None])
+        keys = targets + span * np.arange(len(counts))[:, None]
+        out[present] = np.interp(keys.ravel(), distance + span * row, values).reshape(keys.shape)
+        return out
+
+    def delta_time(self, car, lap, reference_lap, grid):
+        """Time gained (-) or lost (+) against ``reference_lap`` at each grid distance."""
+        times = self.align(car, [lap, reference_lap], "time", grid)
+        return times[0] - times[1]
+
+
+def _accel_to_unit(accel):
+    """Scale longitudinal acceleration (m/s^2) to roughly -1 (full brake) .. +1."""
+    return np.clip(accel / 20.0, -1.0, 1.0)
+
+
+def _speed_profile(geometry, lap_length, smoothing=3.0):
+    """Base speed (m/s) and longitudinal acceleration at each centerline point."""
+    scale = lap_length / geometry.length
+    curvature = np.abs(geometry.curvature[:-1]) / scale
+    corner_speed = np.sqrt(LATERAL_GRIP / np.maximum(curvature, 1e-9))
+    speed = smooth_closed(np.minimum(corner_speed, MAX_SPEED), smoothing)
+    speed = np.append(speed, speed[0])
+
+    distance = geometry.distance * scale
+    accel = speed * np.gradient(speed, distance)
+    return distance, speed, accel
+
+
+def synthesize_lap_channels(geometry, lap_times, hz=20, seed=None, lap_length=5513.0, capacity=None):
+    """
+    Generate high-frequency channels for every car and lap of a race.
+
+    Each lap follows the track's curvature-limited speed profile, scaled to
+    its lap time, with a little noise. Samples are taken every ``1 / hz``
+    seconds, so laps have different sample counts; all of them are computed
+    as one flat batch.
+
+    Args:
+        geometry: TrackGeometry the race runs on
+        lap_times: Lap times in seconds, shape (cars, laps)
+        hz: Sample rate (e.g. 10-60)
+        seed: Seed for ``np.random.default_rng``
+        lap_length: Real lap length in metres (track units are rescaled)
+        capacity: Samples to preallocate (default: exactly what is needed)
+
+    Returns:
+        LapChannels instance
+    """
+    rng = np.random.default_rng(seed)
+    lap_times = np.atleast_2d(np.asarray(lap_times, dtype=float))
+    n_cars, n_laps = lap_times.shape
+    distance, speed, accel = _speed_profile(geometry, lap_length)
+
+    # Time along the lap at the base profile, used to map sample time to distance
+    base_time = np.concatenate(([0.0], np.cumsum(np.diff(distance) / (0.5 * (speed[1:] + speed[:-1])))))
+    base_lap_time = base_time[-1]
+
+    counts = np.ceil(lap_times.ravel() * hz).astype(np.int64)
+    total = int(counts.sum())
+    group = np.repeat(np.arange(counts.size), counts)
+    tick = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+
+    sample_time = tick / hz
+    pace = base_lap_time / lap_times.ravel()[group]
+    sample_distance = np.interp(sample_time * pace, base_time, distance)
+    sample_speed = np.interp(sample_distance, distance, speed) * pace * rng.normal(1.0, 0.005, total) * 3.6
+    sample_accel = np.interp(sample_distance, distance, accel)
+
+    gear = np.clip(1 + sample_speed // SPEED_PER_GEAR, 1, 8)
+    within_gear = (sample_speed - (gear - 1) * SPEED_PER_GEAR) / SPEED_PER_GEAR
+    rpm = IDLE_RPM + np.clip(within_gear, 0.0, 1.0) * (MAX_RPM - IDLE_RPM)
+
+    channels = LapChannels(n_cars, n_laps, hz, lap_length, capacity=capacity or max(total, 1))
+    channels.extend(
+        group // n_laps,
+        group % n_laps,
+        distance=sample_distance,
+        time=sample_time,
+        speed=sample_speed,
+        throttle=np.clip(100 * (0.5 + _accel_to_unit(sample_accel)), 0, 100),
+        brake=np.clip(-100 * _accel_to_unit(sample_accel) - 10, 0, 100),
+        gear=gear,
+        rpm=rpm,
+    )
+    return channels
@@ -0,0 +1,86 @@
+"""
+Polyline simplification for level-of-detail rendering.
+
+Ramer–Douglas–Peucker with an explicit work stack: each step measures every
+point of one span against its chord in a single NumPy call, so there is no
+Python recursion and no per-point loop.
+"""
+
+import numpy as np
+
+
+def _chord_distances(x, y, start, stop):
+    """Distance of points start+1..stop-1 to the chord between start and stop."""
+    px = x[start + 1:stop] - x[start]
+    py = y[start + 1:stop] - y[start]
+    cx = x[stop] - x[start]
+    cy = y[stop] - y[start]
+    chord = np.hypot(cx, cy)
+    if chord == 0:
+        # Closed span (start == end point): fall back to radial distance
+        return np.hypot(px, py)
+    return np.abs(px * cy - py * cx) / chord
+
+
+def simplify_indices(x, y, tolerance, keep=None):
+    """
+    Return sorted indices of the points kept by Ramer–Douglas–Peucker.
+
+    Args:
+        x: Polyline x coordinates
+        y: Polyline y coordinates
+        tolerance: Maximum allowed deviation, in the same units as x/y
+        keep: Optional boolean mask of points that must always be kept
+
+    Returns:
+        np.ndarray of point indices, always including the first and last point
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n <= 2 or tolerance <= 0:
+        return np.arange(n)
+
+    kept = np.zeros(n, dtype=bool)
+    kept[0] = kept[-1] = True
+    if keep is not None:
+        kept |= np.asarray(keep, dtype=bool)
+
+    anchors = np.flatnonzero(kept)
+    stack = [(int(a), int(b)) for a, b in zip(anchors[:-1], anchors[1:]) if b - a > 1]
+    while stack:
+        start, stop = stack.pop()
+        dist = _chord_distances(x, y, start, stop)
+        split = int(np.argmax(dist))
+        if dist[split] > tolerance:
+            split += start + 1
+            kept[split] = True
+            if split - start > 1:
+                stack.append((start, split))
+            if stop - split > 1:
+                stack.append((split, stop))
+
+    return np.flatnonzero(kept)
+
+
+def simplify(x, y, tolerance, keep=None):
+    """Simplify a polyline, returning (x, y) arrays of the kept points."""
+    idx = simplify_indices(x, y, tolerance, keep)
+    return np.asarray(x)[idx], np.asarray(y)[idx]
+
+
+def tolerance_for_pixels(data_span, pixels, pixel_tolerance=0.5):
+    """
+    Convert an on-screen tolerance into data units.
+
+    Args:
+        data_span: Data range shown across the panel's shorter side
+        pixels: Panel size in pixels along that side
+        pixel_tolerance: Largest deviation allowed on screen, in pixels
+
+    Returns:
+        Tolerance in data units
+    """
+    if pixels <= 0:
+        return 0.0
+    return pixel_tolerance * data_span / pixels
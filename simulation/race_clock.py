@@ -0,0 +1,131 @@
+"""
+Drift-free race clock for paced playback.
+
+Race time is derived from a monotonic clock anchored at the last speed change,
+never accumulated from sleeps, so slow renders or a loaded server delay a tick
+but never shift the ones after it. A consumer that falls behind jumps straight
+to the tick that is due now and is told how many frames it skipped.
+"""
+
+import math
+import time
+
+# Playback speed limits (multiples of real time)
+MIN_SPEED = 0.5
+MAX_SPEED = 50.0
+
+
+class RaceClock:
+    """Tick schedule against ``time.monotonic`` with pause and playback speed.
+
+    A tick is ``tick_seconds`` of race time; at speed ``s`` it lasts
+    ``tick_seconds / s`` of wall time. The clock is a few floats, so it can be
+    stored in ``st.session_state`` and read from any rerun.
+    """
+
+    def __init__(self, tick_seconds, speed=1.0, n_ticks=None, clock=time.monotonic):
+        """
+        Args:
+            tick_seconds: Race seconds per tick
+            speed: Initial playback speed, clamped to [MIN_SPEED, MAX_SPEED]
+            n_ticks: Number of ticks in the race, or None for an open-ended clock
+            clock: Monotonic time source in seconds (injectable for replays)
+        """
+        if tick_seconds <= 0:
+            raise ValueError("tick_seconds must be positive")
+        self.tick_seconds = float(tick_seconds)
+        self.n_ticks = n_ticks
+        self._clock = clock
+        self.speed = self.clamp_speed(speed)
+        self.paused = False
+
+        # Race time at the anchor, and the wall time it was taken at
+        self._anchor_race = 0.0
+        self._anchor_wall = clock()
+        self._last_tick = -1
+
+    @staticmethod
+    def clamp_speed(speed):
+        return min(max(float(speed), MIN_SPEED), MAX_SPEED)
+
+    def _reanchor(self):
+        self._anchor_race = self.race_time()
+        self._anchor_wall = self._clock()
+
+    def race_time(self):
+        """Race seconds elapsed, capped at the end of the last tick."""
+        elapsed = self._anchor_race
+        if not self.paused:
+            elapsed += (self._clock() - self._anchor_wall) * self.speed
+        if self.n_ticks is not None:
+            elapsed = min(elapsed, self.n_ticks * self.tick_seconds)
+        return elapsed
+
+    def set_speed(self, speed):
+        """Change playback speed without moving the current race time."""
+        self._reanchor()
+        self.speed = self.clamp_speed(speed)
+
+    def pause(self):
+        if not self.paused:
+            self._reanchor()
+            self.paused = True
+
+    def resume(self):
+        if self.paused:
+            self._anchor_wall = self._clock()
+            self.paused = False
+
+    def seek(self, race_time):
+        """Jump to a race time; the next ``advance`` reports no skipped frames."""
+        self._anchor_race = max(float(race_time), 0.0)
+        self._anchor_wall = self._clock()
+        self._last_tick = self.tick() - 1
+
+    def tick(self):
+        """Index of the tick due now (the last tick once the race has ended)."""
+        tick = int(self.race_time() // self.tick_seconds)
+        if self.n_ticks is not None:
+            tick = min(tick, self.n_ticks - 1)
+        return tick
+
+    @property
+    def finished(self):
+        return self.n_ticks is not None and self.race_time() >= self.n_ticks * self.tick_seconds
+
+    def advance(self):
+        """
+        Move to the tick due now.
+
+        Returns:
+            Tuple (tick, skipped): the current tick index and how many ticks
+            were passed over since the previous call because the consumer
+            fell behind. ``tick`` repeats if no new tick is due yet.
+        """
+        tick = self.tick()
+        skipped = max(tick - self._last_tick - 1, 0)
+        self._last_tick = max(self._last_tick, tick)
+        return tick, skipped
+
+    def seconds_until_next_tick(self):
+        """Wall seconds until the next tick is due (inf while paused or finished)."""
+        if self.paused or self.finished:
+            return math.inf
+        next_boundary = (self.tick() + 1) * self.tick_seconds
+        return max(next_boundary - self.race_time(), 0.0) / self.speed
+
+    def wait(self, sleep=time.sleep):
+        """
+        Sleep until the next tick's deadline, then ``advance`` to it.
+
+        The deadline is computed from the clock each time, so time spent
+        between calls shortens the wait instead of delaying later ticks. A tick
+        that is already due is returned without sleeping.
+        Returns (tick, skipped) as for ``advance``.
+        """
+        if self.tick() > self._last_tick:
+            return self.advance()
+        delay = self.seconds_until_next_tick()
+        if math.isfinite(delay) and delay > 0:
+            sleep(delay)
+        return self.advance()
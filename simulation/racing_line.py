@@ -0,0 +1,137 @@
+"""
+Vectorized racing-line engine for closed circuits.
+
+Every function works on the whole loop at once with wrap-around neighbours, so
+cost is a handful of NumPy passes regardless of point count. A closed input
+(last point equal to the first) keeps its closing point in the output.
+"""
+
+import numpy as np
+
+DEFAULT_TRACK_WIDTH = 12.0
+
+
+def _open_loop(x, y):
+    """Drop a duplicated closing point so np.roll sees each vertex once."""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    closed = len(x) > 1 and x[0] == x[-1] and y[0] == y[-1]
+    if closed:
+        return x[:-1], y[:-1], True
+    return x, y, False
+
+
+def _close_loop(values, closed):
+    if closed:
+        values = np.append(values, values[0])
+    return np.ascontiguousarray(values)
+
+
+def smooth_closed(values, sigma):
+    """Gaussian-smooth a periodic 1D signal (wrap mode, truncated at 4 sigma)."""
+    values = np.asarray(values, dtype=float)
+    if sigma <= 0:
+        return values.copy()
+    radius = int(4 * sigma + 0.5)
+    offsets = np.arange(-radius, radius + 1)
+    kernel = np.exp(-0.5 * (offsets / sigma) ** 2)
+    kernel /= kernel.sum()
+    padded = np.pad(values, radius, mode="wrap")
+    return np.convolve(padded, kernel, mode="valid")
+
+
+def closed_frame(x, y):
+    """
+    Compute unit tangents, left normals and signed curvature around a closed loop.
+
+    Derivatives are central differences with wrap-around, so the start/finish
+    point is treated like any other. Curvature is positive for left-hand turns.
+
+    Args:
+        x: Centerline x coordinates
+        y: Centerline y coordinates
+
+    Returns:
+        Tuple (tangent_x, tangent_y, normal_x, normal_y, curvature) of float arrays
+    """
+    x, y, closed = _open_loop(x, y)
+
+    dx = 0.5 * (np.roll(x, -1) - np.roll(x, 1))
+    dy = 0.5 * (np.roll(y, -1) - np.roll(y, 1))
+    ddx = np.roll(x, -1) - 2 * x + np.roll(x, 1)
+    ddy = np.roll(y, -1) - 2 * y + np.roll(y, 1)
+
+    speed_sq = dx * dx + dy * dy
+    speed = np.sqrt(speed_sq)
+    safe_speed = np.where(speed > 0, speed, 1.0)
+
+    tangent_x = np.where(speed > 0, dx / safe_speed, 0.0)
+    tangent_y = np.where(speed > 0, dy / safe_speed, 0.0)
+    curvature = np.where(speed > 0, (dx * ddy - dy * ddx) / (safe_speed * safe_speed * safe_speed), 0.0)
+
+    return (
+        _close_loop(tangent_x, closed),
+        _close_loop(tangent_y, closed),
+        _close_loop(-tangent_y, closed),
+        _close_loop(tangent_x, closed),
+        _close_loop(curvature, closed),
+    )
+
+
+def offset_line(x, y, offset, sigma=0.0):
+    """
+    Offset a closed centerline along its left normals.
+
+    Args:
+        x: Centerline x coordinates
+        y: Centerline y coordinates
+        offset: Scalar or per-point lateral offset (positive = left)
+        sigma: Optional Gaussian smoothing applied to the centerline first
+
+    Returns:
+        Tuple (line_x, line_y) of contiguous float arrays
+    """
+    x, y, closed = _open_loop(x, y)
+    if sigma > 0:
+        x = smooth_closed(x, sigma)
+        y = smooth_closed(y, sigma)
+    _, _, normal_x, normal_y, _ = closed_frame(x, y)
+
+    offset = np.asarray(offset, dtype=float)
+    if offset.ndim:
+        # Per-point offsets may include the closing point; it mirrors the first
+        offset = offset[: len(x)]
+    return _close_loop(x + normal_x * offset, closed), _close_loop(y + normal_y * offset, closed)
+
+
+def compute_racing_line(track_x, track_y, track_width=DEFAULT_TRACK_WIDTH, sigma=2.0, corner_factor=0.3):
+    """
+    Create an optimal racing line that follows the track geometry.
+
+    The line runs half a track width to the left of the smoothed centerline and
+    pulls in towards it through corners, in proportion to the local curvature
+    relative to the tightest corner on the circuit.
+
+    Args:
+        track_x: Centerline x coordinates
+        track_y: Centerline y coordinates
+        track_width: Usable track width in track units
+        sigma: Gaussian smoothing (in points) applied before differentiating
+        corner_factor: Fraction of the offset given up at the tightest corner
+
+    Returns:
+        Tuple (racing_line_x, racing_line_y) of contiguous float arrays
+    """
+    x, y, closed = _open_loop(track_x, track_y)
+    smooth_x = smooth_closed(x, sigma)
+    smooth_y = smooth_closed(y, sigma)
+    _, _, normal_x, normal_y, curvature = closed_frame(smooth_x, smooth_y)
+
+    abs_curvature = np.abs(curvature)
+    peak = abs_curvature.max() if abs_curvature.size else 0.0
+    corner_weight = abs_curvature / peak if peak > 0 else abs_curvature
+    offset = 0.5 * track_width * (1 - corner_factor * corner_weight)
+
+    line_x = smooth_x + normal_x * offset
+    line_y = smooth_y + normal_y * offset
+    return _close_loop(line_x, closed), _close_loop(line_y, closed)
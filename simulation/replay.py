@@ -0,0 +1,236 @@
+"""
+Recorded races on disk, read back through memory maps.
+
+A recording is a directory of fixed-size chunks of ``chunk_laps`` laps:
+
+    meta.json                  field size, chunk size, sample rate, lap count,
+                               race time at the start of each chunk
+    chunk_00000/lap_time.npy   lap channels, shape (laps, cars)
+    chunk_00000/pit.npy        ...
+    chunk_00000/sample_start.npy, sample_stop.npy
+                               sample range of each (lap, car), shape (laps, cars)
+    chunk_00000/speed.npy      high-frequency channels, flat per chunk
+    ...
+
+Every array is a ``.npy`` file opened with ``mmap_mode="r"``, so opening a
+recording reads only ``meta.json``; a lap is found in O(1) (chunk = lap //
+chunk_laps) and only the pages it touches are read. Race time maps to a lap
+with a binary search over the chunk start times and then one chunk.
+
+Chunks are written as they are produced (``RecordingWriter``), so recording
+a long race never holds more than one chunk in memory either. To record a
+synthetic race from the repository root:
+
+    python -m simulation.replay recordings/cota --cars 20 --laps 60
+
+and play it back with ``RACE_REPLAY=recordings/cota streamlit run app.py``.
+"""
+
+import argparse
+import json
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from .lap_channels import CHANNEL_DTYPES, LapChannels, synthesize_lap_channels
+from .telemetry import DEFAULT_CHUNK_LAPS, iter_telemetry
+from .track_geometry import get_track_geometry
+
+# Bump when the on-disk layout changes
+RECORDING_VERSION = 1
+
+# Chunks kept open (as memory maps) per process
+OPEN_CHUNKS = 8
+
+
+def _chunk_dir(path, chunk):
+    return Path(path) / f"chunk_{chunk:05d}"
+
+
+class RecordingWriter:
+    """Write a race chunk by chunk; ``close()`` (or leaving a ``with`` block) writes meta.json."""
+
+    def __init__(self, path, n_cars, chunk_laps=DEFAULT_CHUNK_LAPS, hz=0, lap_length=5513.0):
+        """
+        Args:
+            path: Recording directory (created if needed)
+            n_cars: Field size
+            chunk_laps: Laps per chunk; every chunk but the last must be this long
+            hz: Sample rate of the high-frequency channels (0 if none)
+            lap_length: Lap length in metres
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.meta = dict(version=RECORDING_VERSION, n_cars=n_cars, n_laps=0, chunk_laps=chunk_laps,
+                         hz=hz, lap_length=float(lap_length), lap_channels=[], sample_channels=[],
+                         chunk_start_times=[])
+        self._closed_short = False
+
+    def write_chunk(self, laps, samples=None):
+        """
+        Write the next chunk.
+
+        Args:
+            laps: Dict of lap channels, shape (cars, laps) as produced by
+                ``iter_telemetry`` (a ``lap`` entry is ignored)
+            samples: Optional LapChannels for the same laps (lap indices
+                relative to the chunk)
+        """
+        if self._closed_short:
+            raise ValueError("only the last chunk may be shorter than chunk_laps")
+        n_laps = laps["lap_time"].shape[1]
+        if n_laps > self.meta["chunk_laps"]:
+            raise ValueError(f"chunk has {n_laps} laps, more than chunk_laps={self.meta['chunk_laps']}")
+        self._closed_short = n_laps < self.meta["chunk_laps"]
+
+        out = _chunk_dir(self.path, len(self.meta["chunk_start_times"]))
+        out.mkdir(exist_ok=True)
+        names = [name for name in laps if name != "lap" and np.ndim(laps[name]) == 2]
+        for name in names:
+            np.save(out / f"{name}.npy", np.ascontiguousarray(np.asarray(laps[name]).T))
+        if samples is not None:
+            np.save(out / "sample_start.npy", np.ascontiguousarray(samples.start.T))
+            np.save(out / "sample_stop.npy", np.ascontiguousarray(samples.stop.T))
+            for name in CHANNEL_DTYPES:
+                np.save(out / f"{name}.npy", samples.samples.column(name))
+            self.meta["sample_channels"] = list(CHANNEL_DTYPES)
+
+        self.meta["lap_channels"] = names
+        race_time = np.asarray(laps["race_time"])
+        self.meta["chunk_start_times"].append(float((race_time[:, 0] - laps["lap_time"][:, 0]).min()))
+        self.meta["n_laps"] += n_laps
+
+    def close(self):
+        (self.path / "meta.json").write_text(json.dumps(self.meta), encoding="utf-8")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def record_race(path, n_cars=1, n_laps=20, seed=None, chunk_laps=DEFAULT_CHUNK_LAPS, geometry=None, hz=20,
+                lap_length=5513.0, **model):
+    """
+    Record a synthetic race, with high-frequency channels if ``geometry`` is given.
+
+    Telemetry is generated and written one chunk at a time.
+
+    Returns:
+        Recording opened on the written directory
+    """
+    telemetry_seed, sample_seed = np.random.SeedSequence(seed).spawn(2)
+    with RecordingWriter(path, n_cars, chunk_laps, hz if geometry is not None else 0, lap_length) as writer:
+        telemetry = iter_telemetry(n_cars, n_laps, telemetry_seed, chunk_laps=chunk_laps, lap_length=lap_length,
+                                   **model)
+        for chunk in telemetry:
+            samples = None
+            if geometry is not None:
+                samples = synthesize_lap_channels(geometry, chunk["lap_time"], hz=hz,
+                                                  seed=sample_seed.spawn(1)[0], lap_length=lap_length)
+            writer.write_chunk(chunk, samples)
+    return Recording(path)
+
+
+@lru_cache(maxsize=OPEN_CHUNKS)
+def _open_chunk(path, chunk, names):
+    """Memory-map the named arrays of one chunk."""
+    return {name: np.load(_chunk_dir(path, chunk) / f"{name}.npy", mmap_mode="r") for name in names}
+
+
+class Recording:
+    """Read-only, memory-mapped access to a recorded race.
+
+    Besides lap-level access it offers ``align`` and ``lap_length``, so it can
+    stand in for LapChannels in the speed-trace panel.
+    """
+
+    def __init__(self, path):
+        self.path = str(Path(path).resolve())
+        self.meta = json.loads((Path(path) / "meta.json").read_text(encoding="utf-8"))
+        if self.meta["version"] != RECORDING_VERSION:
+            raise ValueError(f"unsupported recording version {self.meta['version']}")
+        self.n_cars = self.meta["n_cars"]
+        self.n_laps = self.meta["n_laps"]
+        self.chunk_laps = self.meta["chunk_laps"]
+        self.hz = self.meta["hz"]
+        self.lap_length = self.meta["lap_length"]
+        self.lap_channels = tuple(self.meta["lap_channels"])
+        self.sample_channels = tuple(self.meta["sample_channels"])
+        self._chunk_start_times = np.asarray(self.meta["chunk_start_times"])
+
+    def __len__(self):
+        return self.n_laps
+
+    def _chunk(self, chunk):
+        names = self.lap_channels
+        if self.sample_channels:
+            names += ("sample_start", "sample_stop") + self.sample_channels
+        return _open_chunk(self.path, chunk, names)
+
+    def lap(self, lap):
+        """Every lap channel for one lap (0-based), shape (cars,) each."""
+        if not 0 <= lap < self.n_laps:
+            raise IndexError(f"lap {lap} out of range for a {self.n_laps}-lap recording")
+        chunk, row = divmod(lap, self.chunk_laps)
+        arrays = self._chunk(chunk)
+        return {name: arrays[name][row] for name in self.lap_channels}
+
+    def laps(self, start=0, stop=None):
+        """Lap channels for laps ``start:stop``, shape (laps, cars) each."""
+        stop = self.n_laps if stop is None else min(stop, self.n_laps)
+        if start >= stop:
+            return {name: np.zeros((0, self.n_cars)) for name in self.lap_channels}
+        first, last = start // self.chunk_laps, (stop - 1) // self.chunk_laps
+        parts = {name: [] for name in self.lap_channels}
+        for chunk in range(first, last + 1):
+            offset = chunk * self.chunk_laps
+            rows = slice(max(start - offset, 0), min(stop - offset, self.chunk_laps))
+            arrays = self._chunk(chunk)
+            for name in self.lap_channels:
+                parts[name].append(arrays[name][rows])
+        return {name: blocks[0] if len(blocks) == 1 else np.concatenate(blocks) for name, blocks in parts.items()}
+
+    def lap_at_time(self, race_time):
+        """Index of the lap the leader is on at ``race_time`` (clamped to the race)."""
+        chunk = max(int(np.searchsorted(self._chunk_start_times, race_time, side="right")) - 1, 0)
+        leader = self._chunk(chunk)["race_time"].min(axis=1)
+        lap = chunk * self.chunk_laps + int(np.searchsorted(leader, race_time, side="right"))
+        return min(lap, self.n_laps - 1)
+
+    def samples(self, car, lap):
+        """Dict of views of every high-frequency channel for one car's lap."""
+        chunk, row = divmod(lap, self.chunk_laps)
+        arrays = self._chunk(chunk)
+        sl = slice(arrays["sample_start"][row, car], arrays["sample_stop"][row, car])
+        return {name: arrays[name][sl] for name in self.sample_channels}
+
+    def align(self, car, laps, channel, grid):
+        """``LapChannels.align`` for the requested laps, reading only their samples."""
+        laps = np.atleast_1d(np.asarray(laps, dtype=np.int64))
+        channels = LapChannels(1, len(laps), self.hz, self.lap_length, capacity=1)
+        for i, lap in enumerate(laps):
+            block = self.samples(car, lap)
+            channels.extend(np.zeros(len(block["distance"])), np.full(len(block["distance"]), i), **block)
+        return channels.align(0, np.arange(len(laps)), channel, grid)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record a synthetic race for replay in the dashboard.")
+    parser.add_argument("out", help="recording directory")
+    parser.add_argument("--cars", type=int, default=1, help="cars in the race")
+    parser.add_argument("--laps", type=int, default=20, help="laps in the race")
+    parser.add_argument("--seed", type=int, default=None, help="race seed")
+    parser.add_argument("--hz", type=int, default=20, help="high-frequency sample rate (0 for lap data only)")
+    parser.add_argument("--chunk-laps", type=int, default=DEFAULT_CHUNK_LAPS, help="laps per chunk")
+    args = parser.parse_args(argv)
+
+    geometry = get_track_geometry() if args.hz else None
+    recording = record_race(args.out, args.cars, args.laps, args.seed, args.chunk_laps, geometry, args.hz)
+    print(f"Recorded {recording.n_laps} laps x {recording.n_cars} cars to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Headless season runner: many full-field races with the dashboard's pit calls.
+
+Each race is simulated independently in a worker process from its own child
+of one ``np.random.SeedSequence``, so a season is reproducible from a single
+seed whatever the number of workers or the order races finish in. Finished
+races are written straight to one ``.npz`` file each (one array per channel,
+shape (cars, laps)) and dropped, so memory stays at one race per worker.
+
+Run from the repository root:
+
+    python -m simulation.season --races 24 --cars 20 --laps 60 --out season/
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+
+from .degradation import DegradationModel
+from .strategy import PIT_NOW, PIT_SOON, STAY_OUT, recommend
+from .telemetry import generate_telemetry
+
+# Stored decision codes
+DECISIONS = (STAY_OUT, PIT_SOON, PIT_NOW)
+
+# Fewer scenarios than the dashboard: a season makes cars x laps calls per race
+SEASON_SCENARIOS = 200
+
+
+def race_decisions(telemetry, n_scenarios=SEASON_SCENARIOS, seed=None):
+    """
+    Replay a race lap by lap through the dashboard's decision logic.
+
+    Every car's lap-time model is updated once per lap (all cars in one
+    batched step), then each car gets a Monte Carlo pit call.
+
+    Args:
+        telemetry: ``generate_telemetry`` output
+        n_scenarios: Monte Carlo scenarios per pit option
+        seed: Seed for the strategy draws
+
+    Returns:
+        Dict of (cars, laps) arrays: ``decision`` (index into DECISIONS),
+        ``confidence`` and ``degradation`` (s/lap)
+    """
+    rng = np.random.default_rng(seed)
+    lap_time, tire_wear, fuel, pit = (telemetry[name] for name in ("lap_time", "tire_wear", "fuel", "pit"))
+    n_cars, n_laps = lap_time.shape
+    codes = {decision: code for code, decision in enumerate(DECISIONS)}
+    decision = np.zeros((n_cars, n_laps), dtype=np.uint8)
+    confidence = np.zeros((n_cars, n_laps), dtype=np.float32)
+    degradation = np.zeros((n_cars, n_laps), dtype=np.float32)
+
+    model = DegradationModel(n_cars)
+    for lap in range(n_laps):
+        model.update(lap_time[:, lap], tire_wear[:, lap], fuel[:, lap], valid=~pit[:, lap])
+        degradation[:, lap] = model.degradation_slope
+        seeds = rng.integers(0, 2**32, size=n_cars)
+        for car in range(n_cars):
+            call, _, confidence[car, lap] = recommend(
+                n_laps - lap - 1, tire_wear[car, lap], fuel[car, lap], model.base_pace[car],
+                model.wear_rate[car], wear_time_cost=model.wear_cost[car], fuel_time_cost=model.fuel_cost[car],
+                n_scenarios=n_scenarios, seed=seeds[car],
+            )
+            decision[car, lap] = codes[call]
+    return {"decision": decision, "confidence": confidence, "degradation": degradation}
+
+
+def simulate_race(index, seed, n_cars, n_laps, n_scenarios, out_dir):
+    """Simulate one race and write it to ``out_dir/race_XXXX.npz``; returns the path."""
+    telemetry_seed, strategy_seed = seed.spawn(2)
+    telemetry = generate_telemetry(n_cars, n_laps, seed=telemetry_seed)
+    decisions = race_decisions(telemetry, n_scenarios, seed=strategy_seed)
+    path = Path(out_dir) / f"race_{index:04d}.npz"
+    np.savez(path, race=index, **telemetry, **decisions)
+    return path
+
+
+def run_season(n_races, out_dir, n_cars=20, n_laps=60, seed=0, workers=None, n_scenarios=SEASON_SCENARIOS):
+    """
+    Simulate a season, one output file per race.
+
+    Args:
+        n_races: Races in the season
+        out_dir: Directory for the ``race_XXXX.npz`` files (created if needed)
+        n_cars: Cars per race
+        n_laps: Laps per race
+        seed: Season seed; race ``i`` always gets the same child seed
+        workers: Worker processes (default: one per CPU); 1 runs in-process
+        n_scenarios: Monte Carlo scenarios per pit option
+
+    Returns:
+        List of written paths, in race order
+    """
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    seeds = np.random.SeedSequence(seed).spawn(n_races)
+    jobs = [(index, race_seed, n_cars, n_laps, n_scenarios, out_dir) for index, race_seed in enumerate(seeds)]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return [simulate_race(*job) for job in jobs]
+
+    paths = [None] * n_races
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(simulate_race, *job): job[0] for job in jobs}
+        for future in as_completed(futures):
+            paths[futures[future]] = future.result()
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate a season of races with the dashboard's pit calls.")
+    parser.add_argument("--races", type=int, default=24, help="races in the season")
+    parser.add_argument("--cars", type=int, default=20, help="cars per race")
+    parser.add_argument("--laps", type=int, default=60, help="laps per race")
+    parser.add_argument("--seed", type=int, default=0, help="season seed")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--scenarios", type=int, default=SEASON_SCENARIOS, help="Monte Carlo scenarios per option")
+    parser.add_argument("--out", default="season", help="output directory")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    paths = run_season(args.races, args.out, args.cars, args.laps, args.seed, args.workers, args.scenarios)
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {len(paths)} races to {args.out} in {elapsed:.1f}s ({len(paths) / elapsed:.2f} races/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Vectorized sector timing for a field of cars.
+
+Telemetry samples are (cumulative race distance, race time) per car. Every
+sector boundary a car passed since its previous sample is found by arc
+length, its crossing time is interpolated between the two samples, and
+splits, laps and running bests are updated for the whole field in one pass.
+"""
+
+import numpy as np
+
+# Values returned by SectorTimer.status()
+SLOWER = 0
+PERSONAL_BEST = 1
+OVERALL_BEST = 2
+
+
+class SectorTimer:
+    """Running sector splits, lap times and bests for ``n_cars`` cars.
+
+    All state lives in fixed-size arrays indexed by car (and sector), so the
+    cost of an update depends only on the field size, never on race length.
+    """
+
+    def __init__(self, sector_distances, n_cars):
+        """
+        Args:
+            sector_distances: Sector start distances followed by the lap length,
+                e.g. ``TrackGeometry.sector_distances``
+            n_cars: Number of cars in the field
+        """
+        boundaries = np.asarray(sector_distances, dtype=float)
+        self.sector_starts = boundaries[:-1]
+        self.lap_length = float(boundaries[-1])
+        self.n_sectors = len(self.sector_starts)
+        self.n_cars = n_cars
+
+        self.last_distance = np.full(n_cars, np.nan)
+        self.last_time = np.full(n_cars, np.nan)
+        self.sector_entry_time = np.full(n_cars, np.nan)
+        self.lap_start_time = np.full(n_cars, np.nan)
+
+        # Splits of each car's most recent pass through each sector
+        self.splits = np.full((n_cars, self.n_sectors), np.nan)
+        self.personal_best = np.full((n_cars, self.n_sectors), np.inf)
+        self.overall_best = np.full(self.n_sectors, np.inf)
+
+        self.last_lap = np.full(n_cars, np.nan)
+        self.best_lap = np.full(n_cars, np.inf)
+
+    @classmethod
+    def for_track(cls, geometry, n_cars):
+        """Create a timer using a TrackGeometry's sector boundaries."""
+        return cls(geometry.sector_distances, n_cars)
+
+    def _boundary_index(self, distance):
+        """Global index of the last sector boundary at or before ``distance``."""
+        laps = np.floor(distance / self.lap_length)
+        within = distance - laps * self.lap_length
+        sector = np.searchsorted(self.sector_starts, within, side="right") - 1
+        return (laps * self.n_sectors + sector).astype(np.int64)
+
+    def update(self, distance, time, cars=None):
+        """
+        Feed one telemetry sample per car and record completed sectors.
+
+        Args:
+            distance: Cumulative race distance per car (track units)
+            time: Race time of each sample (seconds)
+            cars: Indices of the cars the samples belong to (default: all)
+
+        Returns:
+            Tuple (car, sector, split) of arrays for the sectors completed by
+            this update, in crossing order per car
+        """
+        cars = np.arange(self.n_cars) if cars is None else np.asarray(cars, dtype=np.intp)
+        distance = np.asarray(distance, dtype=float)
+        time = np.asarray(time, dtype=float)
+
+        prev_distance = self.last_distance[cars]
+        prev_time = self.last_time[cars]
+        self.last_distance[cars] = distance
+        self.last_time[cars] = time
+
+        seen = ~np.isnan(prev_distance)
+        # A car's first sample lying exactly on a boundary starts that sector
+        # (and the lap, on the start line), e.g. seeding the grid at distance 0
+        within = distance - np.floor(distance / self.lap_length) * self.lap_length
+        sector = np.searchsorted(self.sector_starts, within, side="right") - 1
+        on_boundary = ~seen & (within == self.sector_starts[sector])
+        self.sector_entry_time[cars[on_boundary]] = time[on_boundary]
+        on_start = on_boundary & (sector == 0)
+        self.lap_start_time[cars[on_start]] = time[on_start]
+
+        first = self._boundary_index(np.where(seen, prev_distance, distance)) + 1
+        last = self._boundary_index(distance)
+        counts = np.where(seen, np.maximum(last - first + 1, 0), 0)
+        if not counts.any():
+            return np.empty(0, np.intp), np.empty(0, np.intp), np.empty(0)
+
+        # One row per boundary crossed, grouped by car in crossing order
+        row = np.repeat(np.arange(len(cars)), counts)
+        group_start = np.cumsum(counts) - counts
+        boundary = first[row] + (np.arange(counts.sum()) - group_start[row])
+
+        lap_index, sector_index = np.divmod(boundary, self.n_sectors)
+        cross_distance = lap_index * self.lap_length + self.sector_starts[sector_index]
+        travelled = distance[row] - prev_distance[row]
+        frac = np.divide(cross_distance - prev_distance[row], travelled,
+                         out=np.ones_like(travelled), where=travelled > 0)
+        cross_time = prev_time[row] + frac * (time[row] - prev_time[row])
+
+        car = cars[row]
+        is_group_start = np.zeros(len(row), dtype=bool)
+        is_group_start[group_start[counts > 0]] = True
+        entry_time = np.where(is_group_start, self.sector_entry_time[car], np.roll(cross_time, 1))
+        split = cross_time - entry_time
+        completed = (sector_index - 1) % self.n_sectors
+
+        valid = ~np.isnan(split)
+        car_done, sector_done, split_done = car[valid], completed[valid], split[valid]
+        self.splits[car_done, sector_done] = split_done
+        np.minimum.at(self.personal_best, (car_done, sector_done), split_done)
+        np.minimum.at(self.overall_best, sector_done, split_done)
+
+        # Crossing boundary 0 closes a lap; it started at the car's previous
+        # boundary-0 crossing, which may be earlier in this same update
+        lap_rows = np.flatnonzero(sector_index == 0)
+        prev_rows = np.roll(lap_rows, 1)
+        same_car = (np.arange(len(lap_rows)) > 0) & (car[prev_rows] == car[lap_rows])
+        lap_start = np.where(same_car, cross_time[prev_rows], self.lap_start_time[car[lap_rows]])
+        lap_time = cross_time[lap_rows] - lap_start
+        timed = ~np.isnan(lap_time)
+        self.last_lap[car[lap_rows[timed]]] = lap_time[timed]
+        np.minimum.at(self.best_lap, car[lap_rows[timed]], lap_time[timed])
+
+        # Carry entry / lap-start times forward to each car's latest crossing
+        last_row = group_start[counts > 0] + counts[counts > 0] - 1
+        self.sector_entry_time[car[last_row]] = cross_time[last_row]
+        self.lap_start_time[car[lap_rows]] = cross_time[lap_rows]
+
+        return car_done, sector_done, split_done
+
+    def deltas(self):
+        """
+        Return (to_personal_best, to_overall_best) arrays of shape (cars, sectors).
+
+        Sectors a car has not completed yet are NaN.
+        """
+        personal = np.where(np.isfinite(self.personal_best), self.splits - self.personal_best, np.nan)
+        overall = np.where(np.isfinite(self.overall_best), self.splits - self.overall_best, np.nan)
+        return personal, overall
+
+    def status(self):
+        """Per car and sector: OVERALL_BEST, PERSONAL_BEST or SLOWER for the latest split."""
+        status = np.full(self.splits.shape, SLOWER, dtype=np.int8)
+        status[self.splits <= self.personal_best] = PERSONAL_BEST
+        status[self.splits <= self.overall_best] = OVERALL_BEST
+        return status
@@ -0,0 +1,203 @@
+"""
+Monte Carlo pit strategy evaluation.
+
+Every option (stay out, or make the first stop at the end of one of the next
+laps for one of the compounds) is simulated over the same set of random
+scenarios in one NumPy batch of shape (options, scenarios, laps). After the
+first stop the rest of the race is split into equal stints on that compound,
+as many as it takes to keep each set short of ``stint_wear``, so a race
+longer than one stint is scored with the stops it really needs. Each scenario
+draws its own tire degradation for the current and the new sets, pit losses
+and lap-time noise. Options share those draws (common random numbers), so comparing them
+measures the strategy, not the luck of the draw, and the share of scenarios
+an option wins is a direct confidence figure.
+"""
+
+import numpy as np
+
+# Compound name -> (pace offset in s/lap, tire wear in %/lap)
+COMPOUNDS = {
+    "soft": (-0.6, 5.0),
+    "medium": (0.0, 4.0),
+    "hard": (0.5, 3.0),
+}
+
+# Default lap time model, matching simulation.telemetry's defaults
+WEAR_TIME_COST = 0.1    # s per % of tire wear
+FUEL_TIME_COST = 0.03   # s per % of fuel
+CLIFF_WEAR = 80.0       # % wear beyond which grip falls away
+CLIFF_TIME_COST = 0.02  # s per %^2 beyond the cliff
+MAX_WEAR = 100.0        # a set is fully worn here; wear stops growing
+
+# Recommendation buckets for the dashboard card
+PIT_NOW, PIT_SOON, STAY_OUT = "PIT NOW", "PIT SOON", "STAY OUT"
+
+
+class StrategyResult:
+    """Finishing-time distributions of every simulated option.
+
+    Attributes:
+        pit_laps: Laps from now after which each option stops (0 = this lap),
+            or -1 for the no-stop option
+        compounds: Compound fitted by each option (None for no stop)
+        stops: Stops each option makes over the rest of the race
+        finish_times: Time to finish, shape (options, scenarios)
+    """
+
+    def __init__(self, pit_laps, compounds, stops, finish_times):
+        self.pit_laps = pit_laps
+        self.compounds = compounds
+        self.stops = stops
+        self.finish_times = finish_times
+
+    def __len__(self):
+        return len(self.pit_laps)
+
+    def label(self, option):
+        """Card text for ``option``, worded to match its decision bucket."""
+        pit_lap, stops = self.pit_laps[option], self.stops[option]
+        if pit_lap < 0:
+            return "No stop"
+        plan = f"{self.compounds[option]}, {stops} stops" if stops > 1 else self.compounds[option]
+        if _kind(pit_lap) == STAY_OUT:
+            return f"Stay out, pit lap +{pit_lap} ({plan})"
+        return f"Pit lap +{pit_lap} ({plan})"
+
+    def expected(self):
+        """Mean finishing time per option."""
+        return self.finish_times.mean(axis=1)
+
+    def percentiles(self, q=(10, 50, 90)):
+        """Finishing-time percentiles per option, shape (len(q), options)."""
+        return np.percentile(self.finish_times, q, axis=1)
+
+    def win_share(self):
+        """Fraction of scenarios in which each option is the fastest."""
+        winners = np.argmin(self.finish_times, axis=0)
+        return np.bincount(winners, minlength=len(self)) / self.finish_times.shape[1]
+
+    def best(self):
+        """Index of the option with the lowest expected finishing time."""
+        return int(np.argmin(self.expected()))
+
+    def confidence(self, option=None):
+        """
+        Share of scenarios in which ``option`` (default: the best) beats
+        every option of a different kind (stay out vs stop now vs stop later).
+        """
+        option = self.best() if option is None else option
+        kinds = np.array([_kind(p) for p in self.pit_laps])
+        rivals = kinds != kinds[option]
+        if not rivals.any():
+            return 1.0
+        fastest_rival = self.finish_times[rivals].min(axis=0)
+        return float(np.mean(self.finish_times[option] <= fastest_rival))
+
+    def recommendation(self):
+        """Return (decision, option index, confidence) for the best option."""
+        option = self.best()
+        return _kind(self.pit_laps[option]), option, self.confidence(option)
+
+
+def _kind(pit_lap, soon=3):
+    if pit_lap < 0 or pit_lap > soon:
+        return STAY_OUT
+    return PIT_NOW if pit_lap == 0 else PIT_SOON
+
+
+def simulate_strategies(remaining_laps, tire_wear, fuel, base_lap_time, wear_rate=4.0, fuel_rate=4.5,
+                        pit_window=10, compounds=COMPOUNDS, n_scenarios=1000, pit_loss=20.0,
+                        pit_loss_sd=2.0, lap_time_sd=0.5, degradation_sd=0.15, wear_time_cost=WEAR_TIME_COST,
+                        fuel_time_cost=FUEL_TIME_COST, stint_wear=CLIFF_WEAR, seed=None):
+    """
+    Simulate every pit option over the remaining laps.
+
+    Args:
+        remaining_laps: Laps left to race
+        tire_wear: Current tire wear (%)
+        fuel: Current fuel load (%)
+        base_lap_time: Lap time on new medium tires with no fuel (s)
+        wear_rate: Observed wear of the current set (%/lap)
+        fuel_rate: Fuel burnt per lap (%)
+        pit_window: Latest first stop considered, in laps from now
+        compounds: Compound name -> (pace offset, wear per lap)
+        n_scenarios: Scenarios per option
+        pit_loss: Mean time lost in the pit lane (s)
+        pit_loss_sd: Spread of pit loss (s)
+        lap_time_sd: Lap-to-lap noise (s)
+        degradation_sd: Relative spread of each set's wear rate
+        wear_time_cost: Lap time lost per % of tire wear (s), e.g. a DegradationModel fit
+        fuel_time_cost: Lap time lost per % of fuel (s)
+        stint_wear: Expected wear each set fitted at a stop may reach (%)
+        seed: Seed for ``np.random.default_rng``
+
+    Returns:
+        StrategyResult
+    """
+    rng = np.random.default_rng(seed)
+    n_laps = int(remaining_laps)
+    names = list(compounds)
+    offsets = np.array([compounds[name][0] for name in names], dtype=np.float32)
+    rates = np.array([compounds[name][1] for name in names], dtype=np.float32)
+
+    # Options: first stop after lap k (k = 0 .. window) on each compound, plus no stop
+    stops = np.arange(min(pit_window, n_laps - 2) + 1) if n_laps >= 2 else np.zeros(0, dtype=int)
+    pit_laps = np.append(np.repeat(stops, len(names)), -1)
+    option_compound = np.append(np.tile(np.arange(len(names)), len(stops)), 0)
+
+    # The laps after the first stop are split into equal stints, each short of stint_wear
+    stop_lap = np.where(pit_laps < 0, n_laps, pit_laps + 1)                 # last lap on the current set
+    after = np.maximum(n_laps - stop_lap, 1)
+    sets = np.maximum(np.ceil(after * rates[option_compound] / stint_wear), 1).astype(np.int64)
+    n_stops = np.where(pit_laps < 0, 0, sets)
+    if n_laps <= 0:
+        return StrategyResult(pit_laps, [None] * len(pit_laps), n_stops, np.zeros((len(pit_laps), n_scenarios)))
+
+    # Scenario draws shared by every option
+    shape = (n_scenarios, n_laps)
+    current_factor = rng.lognormal(0.0, degradation_sd, n_scenarios).astype(np.float32)
+    new_factor = rng.lognormal(0.0, degradation_sd, (n_scenarios, len(names))).astype(np.float32)
+    losses = rng.normal(pit_loss, pit_loss_sd, (n_scenarios, n_stops.max())).astype(np.float32)
+    noise = rng.normal(0.0, lap_time_sd, shape).astype(np.float32)
+
+    lap = np.arange(1, n_laps + 1)
+    fuel_load = np.maximum(fuel - fuel_rate * lap, 0.0)
+    common = base_lap_time + fuel_time_cost * fuel_load + noise             # (S, L)
+    old_wear = tire_wear + wear_rate * current_factor[:, None] * lap        # (S, L)
+
+    # Laps since the first stop (0 before it) and the age of the set on the
+    # car: stint j of m starts ceil(j * after / m) laps after the first stop
+    on_new = np.maximum(lap[None, :] - stop_lap[:, None], 0)               # (O, L)
+    stint = (np.maximum(on_new - 1, 0) * sets[:, None]) // after[:, None]
+    age = on_new + (-stint * after[:, None]) // sets[:, None]
+    new_rate = rates[option_compound][:, None] * new_factor.T[option_compound]  # (O, S)
+    new_wear = new_rate[:, :, None] * age[:, None, :]                       # (O, S, L)
+    wear = np.minimum(np.where(on_new[:, None, :] > 0, new_wear, old_wear[None]), MAX_WEAR)
+
+    tire_cost = wear_time_cost * wear + CLIFF_TIME_COST * np.maximum(wear - CLIFF_WEAR, 0.0) ** 2
+    pace = np.where(on_new > 0, offsets[option_compound][:, None], 0.0)    # (O, L)
+    finish = (common[None] + tire_cost + pace[:, None, :]).sum(axis=2)
+    # Each option pays the scenario's first n_stops pit losses
+    spent = np.concatenate((np.zeros((n_scenarios, 1), np.float32), np.cumsum(losses, axis=1)), axis=1)
+    finish += spent[:, n_stops].T
+
+    labels = [names[c] if p >= 0 else None for p, c in zip(pit_laps, option_compound)]
+    return StrategyResult(pit_laps, labels, n_stops, finish)
+
+
+def recommend(remaining_laps, tire_wear, fuel, base_lap_time, wear_rate, wear_time_cost=WEAR_TIME_COST,
+              fuel_time_cost=FUEL_TIME_COST, n_scenarios=1000, seed=None):
+    """
+    Pit call for one car: the best simulated option and its confidence.
+
+    The lap-time arguments are typically one car's DegradationModel fit
+    (``base_pace``, ``wear_rate``, ``wear_cost``, ``fuel_cost``).
+
+    Returns:
+        Tuple (decision, option label, confidence)
+    """
+    result = simulate_strategies(remaining_laps, tire_wear, fuel, base_lap_time, wear_rate=wear_rate,
+                                 n_scenarios=n_scenarios, wear_time_cost=wear_time_cost,
+                                 fuel_time_cost=fuel_time_cost, seed=seed)
+    decision, option, confidence = result.recommendation()
+    return decision, result.label(option), confidence
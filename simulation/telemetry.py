@@ -0,0 +1,188 @@
+"""
+Vectorized synthetic race telemetry for any field size and race length.
+
+Every channel for a block of laps is drawn for all cars at once from a
+``np.random.Generator``; there is no per-lap or per-car Python loop. Pit stops
+are planned by drawing stint lengths up front, and tire wear and fuel are
+cumulative sums that restart after each stop, so stints need no sequential
+simulation either.
+
+Long runs are produced lazily by ``iter_telemetry`` in blocks of laps, carrying
+wear, fuel, race time and the distance to the next stop from block to block.
+The same seed and ``chunk_laps`` always give the same data.
+"""
+
+import numpy as np
+
+# Laps generated per block by iter_telemetry
+DEFAULT_CHUNK_LAPS = 2000
+
+# Per-lap channels, shape (cars, laps); "lap" itself is shape (laps,)
+CHANNELS = ("lap_time", "race_time", "tire_wear", "fuel", "pit", "stint")
+
+
+def _stint_cumsum(values, reset, carry):
+    """
+    Running sum along laps that restarts on every lap flagged in ``reset``.
+
+    Args:
+        values: Per-lap increments, shape (cars, laps)
+        reset: True where a new stint starts, shape (cars, laps)
+        carry: Sum already accumulated in the stint running at lap 0, shape (cars,)
+
+    Returns:
+        Array of running sums, shape (cars, laps)
+    """
+    total = np.cumsum(values, axis=1)
+    laps = np.arange(values.shape[1])
+    start = np.maximum.accumulate(np.where(reset, laps, 0), axis=1)
+    before_start = np.take_along_axis(total - values, start, axis=1)
+    restarted = np.logical_or.accumulate(reset, axis=1)
+    return total - before_start + np.where(restarted, 0.0, carry[:, None])
+
+
+def _plan_pit_stops(rng, laps_to_pit, n_laps, stint_laps):
+    """
+    Mark pit laps for a block of laps from randomly drawn stint lengths.
+
+    Args:
+        rng: np.random.Generator
+        laps_to_pit: Per car, laps until the next stop (1 = first lap of the block)
+        n_laps: Laps in the block
+        stint_laps: (shortest, longest) stint length in laps
+
+    Returns:
+        Tuple (pit, laps_to_pit): boolean pit-lap mask of shape (cars, n_laps),
+        and the per-car distance to the first stop after this block
+    """
+    shortest, longest = stint_laps
+    n_stints = n_laps // shortest + 1
+    stints = rng.integers(shortest, longest + 1, size=(len(laps_to_pit), n_stints))
+    pit_index = np.cumsum(np.column_stack([laps_to_pit, stints]), axis=1) - 1
+
+    pit = np.zeros((len(laps_to_pit), n_laps), dtype=bool)
+    car, stop = np.nonzero(pit_index < n_laps)
+    pit[car, pit_index[car, stop]] = True
+
+    upcoming = np.where(pit_index >= n_laps, pit_index, np.iinfo(pit_index.dtype).max)
+    return pit, upcoming.min(axis=1) - n_laps + 1
+
+
+def _sample_channels(rng, lap_time, samples_per_lap, lap_length):
+    """Sub-lap elapsed time and speed, shape (cars, laps, samples)."""
+    fraction = (np.arange(samples_per_lap) + 0.5) / samples_per_lap
+    # Relative pace around the lap: three straights and corners, plus noise
+    pace = 1.0 + 0.25 * np.sin(2 * np.pi * 3 * fraction)
+    # Where on the lap time is gained or lost changes from lap to lap
+    swing = rng.normal(0.0, 0.04, size=lap_time.shape + (1,))
+    phase = rng.uniform(0.0, 2 * np.pi, size=lap_time.shape + (1,))
+    pace = pace * (1.0 + swing * np.sin(2 * np.pi * fraction + phase))
+    pace = pace * rng.normal(1.0, 0.02, size=lap_time.shape + (samples_per_lap,))
+    step = 1.0 / pace
+    step *= (lap_time / step.sum(axis=-1))[..., None]
+    return {
+        "sample_time": np.cumsum(step, axis=-1),
+        "sample_speed": (lap_length / samples_per_lap) / step,
+    }
+
+
+def iter_telemetry(n_cars=1, n_laps=20, seed=None, chunk_laps=DEFAULT_CHUNK_LAPS, samples_per_lap=0,
+                   base_lap_time=90.0, lap_time_sd=2.0, car_pace_sd=0.4,
+                   wear_per_lap=(3.0, 5.0), wear_time_cost=0.1, pit_wear=70.0,
+                   fuel_per_lap=(3.0, 6.0), fuel_time_cost=0.03, pit_loss=20.0, lap_length=5513.0):
+    """
+    Yield synthetic telemetry in blocks of at most ``chunk_laps`` laps.
+
+    Lap time is the car's base pace plus noise, a cost per percent of tire
+    wear and of fuel load, and ``pit_loss`` on the lap a car stops. Each stop
+    fits fresh tires and refuels to 100%. Stint lengths are drawn so that wear
+    at the stop lands around ``pit_wear``.
+
+    Args:
+        n_cars: Number of cars
+        n_laps: Number of laps
+        seed: Seed (or SeedSequence / Generator) for ``np.random.default_rng``
+        chunk_laps: Laps per yielded block
+        samples_per_lap: Sub-lap samples per lap, or 0 for lap-level data only
+        base_lap_time: Mean lap time on new tires with no fuel (s)
+        lap_time_sd: Lap-to-lap noise (s)
+        car_pace_sd: Spread of base pace between cars (s)
+        wear_per_lap: (min, max) tire wear added per lap (%)
+        wear_time_cost: Lap time lost per percent of tire wear (s)
+        pit_wear: Tire wear a stint is planned to end at (%)
+        fuel_per_lap: (min, max) fuel burnt per lap (%)
+        fuel_time_cost: Lap time lost per percent of fuel load (s)
+        pit_loss: Time lost on a pit lap (s)
+        lap_length: Lap length used for sample speeds (m)
+
+    Yields:
+        Dicts with ``lap`` (laps,), every name in CHANNELS (cars, laps) and,
+        when ``samples_per_lap`` is set, ``sample_time`` and ``sample_speed``
+        (cars, laps, samples)
+    """
+    rng = np.random.default_rng(seed)
+    pace = base_lap_time + rng.normal(0.0, car_pace_sd, size=n_cars)
+    # Stints last within 15% of the laps it takes to reach pit_wear at the mean wear rate
+    mean_stint = pit_wear / np.mean(wear_per_lap)
+    stint_laps = (max(round(0.85 * mean_stint), 1), max(round(1.15 * mean_stint), 1))
+
+    # Carried from one block to the next
+    wear = np.zeros(n_cars)
+    fuel_used = np.zeros(n_cars)
+    race_time = np.zeros(n_cars)
+    stint = np.zeros(n_cars, dtype=np.int64)
+    laps_to_pit = rng.integers(stint_laps[0], stint_laps[1] + 1, size=n_cars)
+
+    for first in range(0, n_laps, chunk_laps):
+        size = min(chunk_laps, n_laps - first)
+        shape = (n_cars, size)
+
+        pit, laps_to_pit = _plan_pit_stops(rng, laps_to_pit, size, stint_laps)
+        # A stint starts on the lap after each stop
+        reset = np.zeros(shape, dtype=bool)
+        reset[:, 1:] = pit[:, :-1]
+
+        tire_wear = _stint_cumsum(rng.uniform(*wear_per_lap, size=shape), reset, wear)
+        burnt = _stint_cumsum(rng.uniform(*fuel_per_lap, size=shape), reset, fuel_used)
+        fuel = np.maximum(100.0 - burnt, 0.0)
+
+        lap_time = (pace[:, None] + rng.normal(0.0, lap_time_sd, size=shape)
+                    + wear_time_cost * tire_wear + fuel_time_cost * fuel + pit_loss * pit)
+        lap_race_time = race_time[:, None] + np.cumsum(lap_time, axis=1)
+        stints = stint[:, None] + np.cumsum(reset, axis=1)
+
+        chunk = {
+            "lap": np.arange(first + 1, first + size + 1),
+            "lap_time": lap_time,
+            "race_time": lap_race_time,
+            "tire_wear": tire_wear,
+            "fuel": fuel,
+            "pit": pit,
+            "stint": stints,
+        }
+        if samples_per_lap:
+            chunk.update(_sample_channels(rng, lap_time, samples_per_lap, lap_length))
+        yield chunk
+
+        stopped = pit[:, -1]
+        wear = np.where(stopped, 0.0, tire_wear[:, -1])
+        fuel_used = np.where(stopped, 0.0, burnt[:, -1])
+        race_time = lap_race_time[:, -1]
+        stint = stints[:, -1] + stopped
+
+
+def generate_telemetry(n_cars=1, n_laps=20, seed=None, samples_per_lap=0, **model):
+    """
+    Generate a whole race at once; see ``iter_telemetry`` for the arguments.
+
+    Returns:
+        Dict of arrays covering every lap
+    """
+    chunks = list(iter_telemetry(n_cars, n_laps, seed, chunk_laps=max(n_laps, 1),
+                                 samples_per_lap=samples_per_lap, **model))
+    if len(chunks) == 1:
+        return chunks[0]
+    # n_laps == 0: empty arrays with the usual shapes
+    empty = {"lap": np.zeros(0, dtype=np.int64)}
+    empty.update({name: np.zeros((n_cars, 0)) for name in CHANNELS})
+    return empty
@@ -0,0 +1,145 @@
+"""
+Columnar telemetry store backed by preallocated NumPy arrays.
+
+Each channel is one array, so appending a row is a handful of scalar writes
+and reading a window is a slice, never a pandas lookup or a new Series.
+
+In ring mode every value is written twice, at ``slot`` and ``slot + capacity``
+of a buffer twice the capacity. The most recent ``n <= capacity`` values are
+then always one contiguous slice, so windows stay zero-copy views even after
+the buffer wraps, and memory stays fixed however long a session runs.
+"""
+
+import numpy as np
+
+DEFAULT_CAPACITY = 1024
+
+
+class TelemetryStore:
+    """Append-only table of named channels with zero-copy window views.
+
+    Without ``ring`` the store keeps every row and doubles its arrays when
+    full; with ``ring`` it keeps the latest ``capacity`` rows. Views returned
+    by ``window`` and ``column`` share memory with the store: copy them if
+    they must outlive later appends.
+    """
+
+    def __init__(self, channels, capacity=DEFAULT_CAPACITY, ring=False, row_shape=()):
+        """
+        Args:
+            channels: Channel names (stored as float64), or a dict of name -> dtype
+            capacity: Rows preallocated, and the row limit in ring mode
+            ring: Keep only the latest ``capacity`` rows
+            row_shape: Shape of one row of each channel, e.g. ``(n_cars,)``
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if not isinstance(channels, dict):
+            channels = {name: np.float64 for name in channels}
+        self.dtypes = {name: np.dtype(dtype) for name, dtype in channels.items()}
+        self.capacity = int(capacity)
+        self.ring = ring
+        self.row_shape = tuple(row_shape)
+        # Rows appended since creation (or the last clear), including overwritten ones
+        self.count = 0
+
+        rows = 2 * self.capacity if ring else self.capacity
+        self._columns = {name: np.zeros((rows,) + self.row_shape, dtype=dtype)
+                         for name, dtype in self.dtypes.items()}
+
+    @property
+    def channels(self):
+        return tuple(self._columns)
+
+    def __len__(self):
+        return min(self.count, self.capacity) if self.ring else self.count
+
+    def _grow(self, rows):
+        capacity = self.capacity
+        while capacity < rows:
+            capacity *= 2
+        for name, column in self._columns.items():
+            grown = np.zeros((capacity,) + self.row_shape, dtype=column.dtype)
+            grown[:self.count] = column[:self.count]
+            self._columns[name] = grown
+        self.capacity = capacity
+
+    def append(self, **values):
+        """Append one row; every channel must be given."""
+        if self.ring:
+            slot = self.count % self.capacity
+            for name, column in self._columns.items():
+                value = values[name]
+                column[slot] = value
+                column[slot + self.capacity] = value
+        else:
+            if self.count == self.capacity:
+                self._grow(self.count + 1)
+            for name, column in self._columns.items():
+                column[self.count] = values[name]
+        self.count += 1
+
+    def extend(self, **blocks):
+        """
+        Append a block of rows given as one array per channel.
+
+        Args:
+            **blocks: Channel name -> array whose first axis is the rows
+
+        Returns:
+            Number of rows appended
+        """
+        n = len(next(iter(blocks.values()))) if blocks else 0
+        if n == 0:
+            return 0
+
+        if self.ring:
+            # Rows older than the last `capacity` would be overwritten anyway
+            keep = min(n, self.capacity)
+            slots = (self.count + n - keep + np.arange(keep)) % self.capacity
+            for name, column in self._columns.items():
+                block = np.asarray(blocks[name])[n - keep:]
+                column[slots] = block
+                column[slots + self.capacity] = block
+        else:
+            if self.count + n > self.capacity:
+                self._grow(self.count + n)
+            for name, column in self._columns.items():
+                column[self.count:self.count + n] = blocks[name]
+        self.count += n
+        return n
+
+    def window(self, channel, n=None):
+        """
+        Return a view of the latest ``n`` values of a channel, oldest first.
+
+        Args:
+            channel: Channel name
+            n: Number of rows, or None for every retained row
+
+        Returns:
+            Read-only view into the store
+        """
+        size = len(self)
+        n = size if n is None else min(int(n), size)
+        column = self._columns[channel]
+        if self.ring:
+            end = (self.count - 1) % self.capacity + self.capacity + 1 if self.count else 0
+        else:
+            end = self.count
+        view = column[end - n:end]
+        view.flags.writeable = False
+        return view
+
+    def column(self, channel):
+        """Every retained value of a channel (same as ``window(channel)``)."""
+        return self.window(channel)
+
+    def latest(self, channel, default=None):
+        """The most recent value of a channel, or ``default`` if the store is empty."""
+        if not self.count:
+            return default
+        return self.window(channel, 1)[0]
+
+    def clear(self):
+        self.count = 0
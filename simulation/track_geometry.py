@@ -0,0 +1,305 @@
+"""
+Precomputed circuit geometry shared by every dashboard session.
+
+Sampling the centerline and offsetting the racing line is pure NumPy work whose
+result never changes for a given track definition, so it is done once per
+process and every rerun of every session reuses the same read-only arrays.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from .polyline import simplify_indices
+from .racing_line import DEFAULT_TRACK_WIDTH, closed_frame, compute_racing_line
+
+# Axis range the built-in COTA-style layout is drawn with.
+COTA_VIEW_RANGE = (-130, 130)
+
+# Timing markers for the built-in COTA-style layout.
+# Sector boundaries are centerline point indices at 600 points: [start, end) per sector.
+COTA_SECTOR_BOUNDARIES = (0, 150, 300, 600)
+
+# DRS detection zones and speed trap as closed (x, y) rectangles.
+COTA_DRS_ZONES = (
+    ((0, 5, 5, 0, 0), (58, 58, 62, 62, 58)),      # before Turn 11
+    ((-2, 2, 2, -2, -2), (62, 62, 65, 65, 62)),   # before Turn 19
+)
+COTA_SPEED_TRAP = ((-10, -5, -5, -10, -10), (55, 55, 58, 58, 55))
+
+
+def create_track_layout(n_points=600):
+    """Create a smooth Circuit of the Americas-style circular track layout."""
+    # Define the angular path for a looping track with varied turns
+    theta = np.linspace(0, 2 * np.pi, n_points)
+
+    # Base radius variation to create a more dynamic track
+    r = 100 + 10 * np.sin(3 * theta) + 5 * np.sin(6 * theta)
+
+    # Convert polar to cartesian
+    x = r * np.cos(theta)
+    y = r * np.sin(theta)
+
+    # Add "COTA-like" character: tighter esses and long straight
+    # Create an S-section between angles 0.3π to 0.7π
+    mask = (theta > 0.3 * np.pi) & (theta < 0.7 * np.pi)
+    y[mask] += 25 * np.sin(8 * theta[mask])
+
+    # Simulate a long straight at the back of the circuit
+    mask_straight = (theta > 1.1 * np.pi) & (theta < 1.4 * np.pi)
+    x[mask_straight] = np.linspace(80, -80, mask_straight.sum())
+
+    # Close the loop cleanly
+    x[-1] = x[0]
+    y[-1] = y[0]
+
+    return x, y
+
+
+def _closed(x, y):
+    """Append the first point if the loop is not already closed."""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if len(x) and (x[0] != x[-1] or y[0] != y[-1]):
+        x = np.append(x, x[0])
+        y = np.append(y, y[0])
+    return x, y
+
+
+def _square_view(x, y, padding=0.1):
+    """Axis range of a square view around the centerline, padded on each side."""
+    center = 0.5 * (max(x.max(), y.max()) + min(x.min(), y.min()))
+    half = 0.5 * max(x.max() - x.min(), y.max() - y.min()) * (1 + 2 * padding)
+    return center - half, center + half
+
+
+def _frozen(values):
+    """Return a contiguous float array that cannot be mutated by callers."""
+    arr = np.ascontiguousarray(values, dtype=float)
+    arr.setflags(write=False)
+    return arr
+
+
+class TrackGeometry:
+    """Immutable geometry for one circuit: centerline, racing line and timing markers.
+
+    Instances are shared between sessions through ``get_track_geometry``, so
+    every array is read-only. Sector accessors return views, not copies.
+    """
+
+    # Array attributes persisted by ``to_arrays`` / restored by ``from_arrays``
+    ARRAY_FIELDS = (
+        "x", "y", "tangent_x", "tangent_y", "normal_x", "normal_y", "curvature",
+        "racing_x", "racing_y", "sector_boundaries", "drs_zones", "speed_trap", "distance",
+    )
+
+    def __init__(self, name, x, y, racing_x, racing_y, sector_boundaries, drs_zones, speed_trap,
+                 track_width=DEFAULT_TRACK_WIDTH, view_range=None):
+        self.name = name
+        self.track_width = float(track_width)
+        x, y = _closed(x, y)
+        self.x = _frozen(x)
+        self.y = _frozen(y)
+        if view_range is None:
+            view_range = _square_view(self.x, self.y)
+        self.view_range = (float(view_range[0]), float(view_range[1]))
+        tangent_x, tangent_y, normal_x, normal_y, curvature = closed_frame(self.x, self.y)
+        self.tangent_x = _frozen(tangent_x)
+        self.tangent_y = _frozen(tangent_y)
+        self.normal_x = _frozen(normal_x)
+        self.normal_y = _frozen(normal_y)
+        # Signed curvature of the centerline, positive for left-hand turns
+        self.curvature = _frozen(curvature)
+        self.racing_x = _frozen(racing_x)
+        self.racing_y = _frozen(racing_y)
+        self.sector_boundaries = np.asarray(sector_boundaries, dtype=np.intp)
+        self.sector_boundaries.setflags(write=False)
+        # Shape (n_zones, 2, n_vertices): x row then y row for each polygon;
+        # polygons with fewer vertices repeat their last vertex as padding
+        self.drs_zones = _frozen(drs_zones)
+        self.speed_trap = _frozen(speed_trap)
+
+        # Arc-length index: distance[i] is the distance from the start line to
+        # point i along the centerline, so distance[-1] is the lap length.
+        segment = np.hypot(np.diff(self.x), np.diff(self.y))
+        self.distance = _frozen(np.concatenate(([0.0], np.cumsum(segment))))
+        self.length = float(self.distance[-1])
+        self.sector_distances = _frozen(self.distance[np.minimum(self.sector_boundaries, self.n_points - 1)])
+
+        # Simplified copies of the lines, keyed by tolerance (see ``lod``)
+        self._lod_cache = {}
+
+    def to_arrays(self):
+        """Return (meta, arrays): JSON-ready scalars and every precomputed array."""
+        meta = {"name": self.name, "track_width": self.track_width, "view_range": list(self.view_range)}
+        return meta, {field: getattr(self, field) for field in self.ARRAY_FIELDS}
+
+    @classmethod
+    def from_arrays(cls, meta, arrays):
+        """
+        Rebuild a geometry from ``to_arrays`` output without recomputing anything.
+
+        Arrays are used as given (they may be read-only memory maps), so
+        loading a compiled track costs no smoothing or differentiation.
+        """
+        geometry = cls.__new__(cls)
+        geometry.name = meta["name"]
+        geometry.track_width = float(meta["track_width"])
+        geometry.view_range = tuple(meta["view_range"])
+        for field in cls.ARRAY_FIELDS:
+            value = arrays[field]
+            if value.flags.writeable:
+                value.setflags(write=False)
+            setattr(geometry, field, value)
+        geometry.length = float(geometry.distance[-1])
+        geometry.sector_distances = _frozen(
+            geometry.distance[np.minimum(geometry.sector_boundaries, geometry.n_points - 1)]
+        )
+        geometry._lod_cache = {}
+        return geometry
+
+    @property
+    def n_points(self):
+        return len(self.x)
+
+    @property
+    def n_sectors(self):
+        return len(self.sector_boundaries) - 1
+
+    def sector(self, index):
+        """Return (x, y) views of the centerline for sector ``index`` (0-based)."""
+        start, stop = self.sector_boundaries[index], self.sector_boundaries[index + 1]
+        return self.x[start:stop], self.y[start:stop]
+
+    def lod(self, tolerance, corner_quantile=0.95):
+        """
+        Return a simplified copy of the drawable lines for a given tolerance.
+
+        Lines are decimated with Ramer–Douglas–Peucker; points in the tightest
+        corners (curvature above ``corner_quantile``) are always kept so
+        apexes keep full detail. Results are cached per tolerance.
+
+        Args:
+            tolerance: Maximum deviation in track units (0 = full detail)
+            corner_quantile: Curvature quantile above which points are kept
+
+        Returns:
+            Dict with ``x``, ``y``, ``racing_x``, ``racing_y`` arrays and
+            ``sectors``, a list of (x, y) pairs
+        """
+        cache_key = (round(float(tolerance), 6), corner_quantile)
+        cached = self._lod_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        corners = np.abs(self.curvature)
+        keep = corners >= np.quantile(corners, corner_quantile)
+        idx = simplify_indices(self.x, self.y, tolerance, keep)
+        racing_idx = simplify_indices(self.racing_x, self.racing_y, tolerance)
+
+        sectors = []
+        for start, stop in zip(self.sector_boundaries[:-1], self.sector_boundaries[1:]):
+            last = min(stop, self.n_points) - 1
+            inner = idx[(idx > start) & (idx < last)]
+            sector_idx = np.concatenate(([start], inner, [last]))
+            sectors.append((self.x[sector_idx], self.y[sector_idx]))
+
+        level = {
+            "x": self.x[idx],
+            "y": self.y[idx],
+            "racing_x": self.racing_x[racing_idx],
+            "racing_y": self.racing_y[racing_idx],
+            "sectors": sectors,
+        }
+        self._lod_cache[cache_key] = level
+        return level
+
+    def position_at_distance(self, distance):
+        """
+        Map distance along the lap to centerline coordinates.
+
+        Distances wrap modulo the lap length, so cumulative race distance can
+        be passed directly. Accepts scalars or arrays of any shape; each
+        lookup is a binary search over the arc-length index.
+
+        Args:
+            distance: Distance(s) from the start line in track units
+
+        Returns:
+            Tuple (x, y) with the same shape as ``distance``
+        """
+        d = np.mod(np.asarray(distance, dtype=float), self.length) if self.length > 0 else np.zeros(np.shape(distance))
+        idx = np.searchsorted(self.distance, d, side="right") - 1
+        idx = np.clip(idx, 0, self.n_points - 2)
+
+        start = self.distance[idx]
+        span = self.distance[idx + 1] - start
+        frac = np.divide(d - start, span, out=np.zeros_like(d), where=span > 0)
+
+        x = self.x[idx] + frac * (self.x[idx + 1] - self.x[idx])
+        y = self.y[idx] + frac * (self.y[idx + 1] - self.y[idx])
+        return x, y
+
+    def position_at_fraction(self, fraction):
+        """Map lap fraction(s) (0 = start line, 1 = one full lap) to coordinates."""
+        return self.position_at_distance(np.asarray(fraction, dtype=float) * self.length)
+
+    def car_position(self, lap, laps):
+        """Get car position along the track, spaced evenly by distance"""
+        progress = (lap % laps) / laps if laps > 0 else 0
+        x, y = self.position_at_fraction(progress)
+        return float(x), float(y)
+
+
+def _build_cota(n_points=None, track_width=None):
+    n_points = n_points or 600
+    track_width = track_width or DEFAULT_TRACK_WIDTH
+    track_x, track_y = create_track_layout(n_points)
+    racing_x, racing_y = compute_racing_line(track_x, track_y, track_width=track_width)
+    # Boundaries are defined for 600 points; rescale for other resolutions
+    sector_boundaries = np.round(np.asarray(COTA_SECTOR_BOUNDARIES) * n_points / 600).astype(np.intp)
+    return TrackGeometry(
+        "cota",
+        track_x,
+        track_y,
+        racing_x,
+        racing_y,
+        sector_boundaries,
+        COTA_DRS_ZONES,
+        COTA_SPEED_TRAP,
+        track_width=track_width,
+        view_range=COTA_VIEW_RANGE,
+    )
+
+
+TRACK_BUILDERS = {
+    "cota": _build_cota,
+}
+
+
+@lru_cache(maxsize=None)
+def get_track_geometry(name="cota", n_points=None, track_width=None):
+    """
+    Return the shared TrackGeometry for a track definition.
+
+    The first call per process builds the geometry; later calls, from any
+    Streamlit session or thread, return the same object. Names that are not
+    built in are looked up as circuit files (see ``simulation.circuits``).
+
+    Args:
+        name: Key in ``TRACK_BUILDERS`` or a circuit file name
+        n_points: Centerline resolution, or None for the definition's default
+        track_width: Usable track width, or None for the definition's default
+
+    Returns:
+        TrackGeometry instance
+    """
+    if name in TRACK_BUILDERS:
+        return TRACK_BUILDERS[name](n_points=n_points, track_width=track_width)
+
+    from .circuits import available_circuits, load_circuit
+
+    if name not in available_circuits():
+        known = sorted(set(TRACK_BUILDERS) | set(available_circuits()))
+        raise ValueError(f"Unknown track '{name}'. Available: {', '.join(known)}")
+    return load_circuit(name, n_points=n_points, track_width=track_width)
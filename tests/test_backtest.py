@@ -0,0 +1,36 @@
+import numpy as np
+
+from simulation.backtest import _stints, backtest_thresholds, stack_races
+
+
+def make_race(tire_wear, pit, stint):
+    tire_wear = np.atleast_2d(np.asarray(tire_wear, dtype=float))
+    return {
+        "lap_time": np.full(tire_wear.shape, 90.0),
+        "tire_wear": tire_wear,
+        "pit": np.atleast_2d(np.asarray(pit, dtype=bool)),
+        "stint": np.atleast_2d(np.asarray(stint)),
+    }
+
+
+def test_stints_split_per_car_and_skip_padding():
+    long_race = make_race([[10, 20, 30, 5, 10], [4, 8, 12, 16, 20]],
+                          [[0, 0, 1, 0, 0], [0, 0, 0, 0, 0]], [[0, 0, 0, 1, 1], [0, 0, 0, 0, 0]])
+    short_race = make_race([[25, 50, 75]], [[0, 0, 1]], [[0, 0, 0]])
+    laps = _stints(stack_races([long_race, short_race]))
+
+    # A car without stops never merges with the next car's first stint
+    np.testing.assert_array_equal(laps["starts"], [0, 3, 5, 10, 13, 15])
+    np.testing.assert_array_equal(laps["lengths"], [3, 2, 5, 3, 2, 5])
+    np.testing.assert_array_equal(laps["valid"], [True, True, True, True, False, False])
+    np.testing.assert_array_equal(laps["stopped"], [True, False, False, True, False, False])
+    np.testing.assert_array_equal(laps["position"][:5], [0, 1, 2, 0, 1])
+
+
+def test_call_error_against_the_recorded_stop():
+    race = make_race([[30, 50, 70, 10, 20]], [[0, 0, 1, 0, 0]], [[0, 0, 0, 1, 1]])
+    result = backtest_thresholds([race], pit_wear=[65.0, 45.0, 80.0], lap_delta=1.0, monitor_wear=40.0)
+
+    np.testing.assert_array_equal(result["mean_error"], [0.0, -1.0, 1.0])
+    np.testing.assert_array_equal(result["late_share"], [0.0, 0.0, 1.0])
+    np.testing.assert_array_equal(result["unneeded_stops"], [0.0, 0.0, 0.0])
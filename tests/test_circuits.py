@@ -0,0 +1,21 @@
+import json
+
+import numpy as np
+
+from simulation.circuits import load_circuit
+
+
+def test_drs_zones_with_different_vertex_counts(tmp_path):
+    angle = np.linspace(0.0, 2 * np.pi, 50, endpoint=False)
+    np.savetxt(tmp_path / "ring.csv", np.column_stack([100 * np.cos(angle), 100 * np.sin(angle)]),
+               delimiter=",", header="x,y", comments="")
+    quad = [[0, 10, 10, 0], [0, 0, 10, 10]]
+    ring = [[0, 10, 10, 0, 0], [0, 0, 10, 10, 0]]
+    definition = {"centerline": "ring.csv", "points": 200, "drs_zones": [quad, ring]}
+    (tmp_path / "ring.json").write_text(json.dumps(definition))
+
+    geometry = load_circuit("ring", tracks_dir=tmp_path, cache_dir=tmp_path / "cache")
+
+    assert geometry.drs_zones.shape == (2, 2, 5)
+    np.testing.assert_array_equal(geometry.drs_zones[0, :, 4], geometry.drs_zones[0, :, 3])
+    np.testing.assert_array_equal(geometry.drs_zones[1], ring)
@@ -0,0 +1,26 @@
+import numpy as np
+
+from simulation.downsampling import minmax_indices
+
+
+def test_minmax_keeps_extremes_in_sample_order():
+    y = [3, 1, 4, 1, 5, 9, 2, 6, 5, 3]
+    indices, n_complete = minmax_indices(y, 4)
+
+    np.testing.assert_array_equal(indices, [1, 2, 5, 6, 8, 9])
+    assert n_complete == 4
+
+
+def test_complete_buckets_are_stable_when_appending():
+    rng = np.random.default_rng(0)
+    y = rng.normal(size=1000)
+    before, n_complete = minmax_indices(y[:730], 16)
+    after, _ = minmax_indices(y, 16)
+
+    np.testing.assert_array_equal(after[:n_complete], before[:n_complete])
+
+
+def test_nan_samples_never_win():
+    indices, _ = minmax_indices([np.nan, 2.0, 1.0, np.nan, np.nan, np.nan], 3)
+
+    np.testing.assert_array_equal(indices, [1, 2, 3])
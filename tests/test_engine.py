@@ -0,0 +1,16 @@
+import numpy as np
+
+from simulation import RaceEngine, get_track_geometry
+
+
+def test_sector_splits_come_from_sub_lap_samples():
+    geometry = get_track_geometry()
+    engine = RaceEngine(6, n_cars=4, seed=1, geometry=geometry)
+    shares = []
+    while engine.step():
+        splits = engine.sectors.splits
+        np.testing.assert_allclose(splits.sum(axis=1), engine.store.latest("lap_time"))
+        shares.append(splits / splits.sum(axis=1, keepdims=True))
+
+    # Each sector's share of the lap moves from lap to lap
+    assert np.ptp(np.array(shares), axis=0).min() > 1e-3
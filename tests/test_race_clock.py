@@ -0,0 +1,54 @@
+import pytest
+
+from simulation.race_clock import RaceClock
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_advance_counts_skipped_ticks():
+    clock = FakeClock()
+    race = RaceClock(2.0, clock=clock)
+
+    assert race.advance() == (0, 0)
+    clock.now += 1.0
+    assert race.advance() == (0, 0)
+    clock.now += 7.5
+    assert race.advance() == (4, 3)
+    assert race.advance() == (4, 0)
+
+
+def test_speed_change_keeps_race_time():
+    clock = FakeClock()
+    race = RaceClock(2.0, clock=clock)
+    clock.now += 3.0
+    race.set_speed(10)
+
+    assert race.race_time() == pytest.approx(3.0)
+    clock.now += 1.0
+    assert race.race_time() == pytest.approx(13.0)
+    assert race.advance() == (6, 6)
+
+
+def test_pause_and_seek():
+    clock = FakeClock()
+    race = RaceClock(2.0, n_ticks=5, clock=clock)
+    clock.now += 3.0
+    race.pause()
+    clock.now += 50.0
+    assert race.race_time() == pytest.approx(3.0)
+
+    race.resume()
+    clock.now += 1.0
+    assert race.race_time() == pytest.approx(4.0)
+
+    race.seek(7.0)
+    assert race.advance() == (3, 0)
+    clock.now += 100.0
+    assert race.finished
+    assert race.advance() == (4, 0)
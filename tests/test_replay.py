@@ -0,0 +1,27 @@
+import numpy as np
+
+from simulation.replay import record_race
+from simulation.telemetry import iter_telemetry
+
+
+def test_laps_and_seeks_across_chunks(tmp_path):
+    recording = record_race(tmp_path / "race", n_cars=3, n_laps=11, seed=5, chunk_laps=4)
+    chunks = list(iter_telemetry(3, 11, np.random.SeedSequence(5).spawn(2)[0], chunk_laps=4))
+    telemetry = {name: np.concatenate([chunk[name] for chunk in chunks], axis=1) for name in ("lap_time", "race_time")}
+
+    assert recording.meta["chunk_start_times"][0] == 0.0
+    for lap in (0, 3, 4, 7, 8, 10):
+        np.testing.assert_array_equal(recording.lap(lap)["lap_time"], telemetry["lap_time"][:, lap])
+    np.testing.assert_array_equal(recording.laps(2, 9)["race_time"], telemetry["race_time"][:, 2:9].T)
+
+
+def test_lap_at_time_at_chunk_boundaries(tmp_path):
+    recording = record_race(tmp_path / "race", n_cars=3, n_laps=11, seed=5, chunk_laps=4)
+    leader = recording.laps()["race_time"].min(axis=1)
+
+    assert recording.lap_at_time(0.0) == 0
+    # Leader finishing lap 4 (the last of chunk 0) moves on to lap 5, the first of chunk 1
+    assert recording.lap_at_time(leader[3] - 1e-6) == 3
+    assert recording.lap_at_time(leader[3]) == 4
+    assert recording.lap_at_time(leader[7]) == 8
+    assert recording.lap_at_time(leader[-1] + 100.0) == 10
@@ -0,0 +1,23 @@
+import numpy as np
+
+from simulation.sector_timing import SectorTimer
+
+
+def test_grid_seed_times_first_lap():
+    timer = SectorTimer([0.0, 100.0, 200.0, 300.0], n_cars=2)
+    timer.update([0.0, 0.0], [0.0, 0.0])
+    timer.update([300.0, 300.0], [30.0, 33.0])
+
+    assert np.isfinite(timer.splits).all()
+    np.testing.assert_allclose(timer.splits[0], [10.0, 10.0, 10.0])
+    np.testing.assert_allclose(timer.last_lap, [30.0, 33.0])
+
+
+def test_seed_off_boundary_leaves_first_sector_untimed():
+    timer = SectorTimer([0.0, 100.0, 200.0, 300.0], n_cars=1)
+    timer.update([50.0], [5.0])
+    timer.update([300.0], [30.0])
+
+    assert np.isnan(timer.splits[0, 0])
+    np.testing.assert_allclose(timer.splits[0, 1:], [10.0, 10.0])
+    assert np.isnan(timer.last_lap[0])
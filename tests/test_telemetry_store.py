@@ -0,0 +1,43 @@
+import numpy as np
+
+from simulation.telemetry_store import TelemetryStore
+
+
+def test_ring_window_after_wrapping():
+    store = TelemetryStore(["x"], capacity=4, ring=True)
+    for value in range(10):
+        store.append(x=value)
+
+    assert len(store) == 4
+    np.testing.assert_array_equal(store.window("x"), [6, 7, 8, 9])
+    np.testing.assert_array_equal(store.window("x", 2), [8, 9])
+    assert store.latest("x") == 9
+
+
+def test_ring_extend_with_more_rows_than_capacity():
+    store = TelemetryStore(["x"], capacity=4, ring=True)
+    store.append(x=-1)
+    assert store.extend(x=np.arange(10)) == 10
+
+    assert store.count == 11
+    np.testing.assert_array_equal(store.column("x"), [6, 7, 8, 9])
+    store.extend(x=[10, 11])
+    np.testing.assert_array_equal(store.column("x"), [8, 9, 10, 11])
+
+
+def test_ring_extend_overwrites_part_of_the_buffer():
+    store = TelemetryStore(["x"], capacity=5, ring=True)
+    store.extend(x=np.arange(4))
+    store.extend(x=np.arange(4, 7))
+
+    np.testing.assert_array_equal(store.column("x"), [2, 3, 4, 5, 6])
+    np.testing.assert_array_equal(store.window("x", 3), [4, 5, 6])
+
+
+def test_growing_store_keeps_every_row():
+    store = TelemetryStore({"x": np.int64}, capacity=2, row_shape=(3,))
+    store.extend(x=np.arange(15).reshape(5, 3))
+    store.append(x=[15, 16, 17])
+
+    assert len(store) == 6 and store.capacity >= 6
+    np.testing.assert_array_equal(store.column("x").ravel(), np.arange(18))